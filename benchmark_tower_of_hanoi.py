@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+
+IMPLEMENTATION_NAMES = ('imperative', 'functional')
+
+_MIN_TIMING_COUNT = 3
+_MIN_TIMING_SECONDS = 0.2
+
+def load_implementation(name):
+    '''
+    Loads the `tower_of_hanoi` module of the specified implementation.
+
+    Both implementations use the same module name, so each one is loaded
+    under a distinct name instead of through the regular import machinery.
+    The sibling modules it imports are loaded from its own directory and are
+    removed from `sys.modules` afterwards so they are not shared with the
+    other implementation.
+    '''
+
+    directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    spec = importlib.util.spec_from_file_location('{0}_tower_of_hanoi'.format(name), os.path.join(directory, 'tower_of_hanoi.py'))
+    module = importlib.util.module_from_spec(spec)
+    module_names = set(sys.modules)
+    sys.path.insert(0, directory)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(directory)
+        for module_name in set(sys.modules) - module_names:
+            if os.path.dirname(getattr(sys.modules[module_name], '__file__', None) or '') == directory:
+                del sys.modules[module_name]
+    return module
+
+def recursive_imperative_move(disk_count, source_peg, destination_peg, intermediate_peg, callback=(lambda *args, **kwargs: None)):
+    '''
+    The original recursive imperative `Game.move`, kept as a reference.
+    '''
+
+    if disk_count > 1:
+        recursive_imperative_move(disk_count - 1, source_peg, intermediate_peg, destination_peg, callback)
+    destination_peg.push(source_peg.pop())
+    callback([source_peg, destination_peg, intermediate_peg])
+    if disk_count > 1:
+        recursive_imperative_move(disk_count - 1, intermediate_peg, destination_peg, source_peg, callback)
+
+def recursive_functional_move(disk_count, source_peg, destination_peg, intermediate_peg, callback=(lambda *args, **kwargs: None)):
+    '''
+    The original recursive functional `Game.move`, kept as a reference.
+    '''
+
+    if disk_count > 1:
+        source_peg, intermediate_peg, destination_peg = recursive_functional_move(disk_count - 1, source_peg, intermediate_peg, destination_peg, callback)
+    source_peg, disk = source_peg.pop()
+    destination_peg = destination_peg.push(disk)
+    callback([source_peg, destination_peg, intermediate_peg])
+    if disk_count > 1:
+        intermediate_peg, destination_peg, source_peg = recursive_functional_move(disk_count - 1, intermediate_peg, destination_peg, source_peg, callback)
+    return (source_peg, destination_peg, intermediate_peg)
+
+class ListPeg:
+    '''
+    The original list-backed functional `Peg`, kept as a reference.
+
+    Only the methods used by `Game.move` are provided.
+    '''
+
+    def __init__(self, name, disks=[]):
+        self._disks = disks[:]
+        self._name = name
+
+    def pop(self):
+        if len(self._disks) == 0:
+            raise Exception('peg is empty')
+
+        return (ListPeg(self._name, self._disks[0:-1]), self._disks[-1])
+
+    def push(self, disk):
+        if (len(self._disks) != 0) and not (disk < self._disks[-1]):
+            raise Exception('disk must be smaller than top disk')
+
+        return ListPeg(self._name, self._disks + [disk])
+
+def ignore_pegs(pegs):
+    '''
+    A callback of the functional `Game.move` that does nothing, so the cost
+    of calling a callback is measured without the cost of any work it does.
+    '''
+
+    pass
+
+def measure_allocations(module, peg_class, disk_count):
+    '''
+    Returns the mean count of bytes allocated and retained by each move of
+    the functional `Game.move` when it solves a game with the specified
+    number of disks using pegs of the specified class.
+
+    The bytes allocated by a move are estimated as the peak traced memory
+    during the move less the traced memory before it.  The bytes retained by
+    a move are those still traced when the pegs of every intermediate state
+    are kept alive.
+    '''
+
+    def create_pegs():
+        return (
+            peg_class('A', [module.Disk(disk_size) for disk_size in range(disk_count, 0, -1)]),
+            peg_class('C'),
+            peg_class('B')
+        )
+
+    move_count = 2 ** disk_count - 1
+    allocated_bytes = 0
+    previous_bytes = 0
+
+    def measure_move(pegs):
+        nonlocal allocated_bytes, previous_bytes
+        allocated_bytes += tracemalloc.get_traced_memory()[1] - previous_bytes
+        tracemalloc.reset_peak()
+        previous_bytes = tracemalloc.get_traced_memory()[0]
+
+    states = []
+    game = module.Game()
+    tracemalloc.start()
+    try:
+        pegs = create_pegs()
+        previous_bytes = tracemalloc.get_traced_memory()[0]
+        game.move(disk_count, *pegs, measure_move)
+
+        pegs = create_pegs()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        game.move(disk_count, *pegs, states.append)
+        retained_bytes = tracemalloc.get_traced_memory()[0] - start_bytes
+    finally:
+        tracemalloc.stop()
+    return (allocated_bytes / move_count, retained_bytes / move_count)
+
+def print_allocations(disk_counts):
+    module = load_implementation('functional')
+    print('{0:>10} {1:>5} {2:>16} {3:>16}'.format('peg', 'disks', 'allocated/move', 'retained/move'))
+    for disk_count in disk_counts:
+        for name, peg_class in [('list', ListPeg), ('persistent', module.Peg)]:
+            allocated_bytes, retained_bytes = measure_allocations(module, peg_class, disk_count)
+            print('{0:>10} {1:>5} {2:>16.1f} {3:>16.1f}'.format(name, disk_count, allocated_bytes, retained_bytes))
+
+def time_move(move, game, disk_count):
+    '''
+    Returns the wall time, in seconds, taken by `move` to solve a game with
+    the specified number of disks.
+    '''
+
+    source_peg = game.create_peg('A', disk_count)
+    destination_peg = game.create_peg('C')
+    intermediate_peg = game.create_peg('B')
+    start_time = time.perf_counter()
+    move(disk_count, source_peg, destination_peg, intermediate_peg)
+    return time.perf_counter() - start_time
+
+def print_move_times(disk_counts):
+    engines = []
+    for name, recursive_move in [('imperative', recursive_imperative_move), ('functional', recursive_functional_move)]:
+        game = load_implementation(name).Game()
+        engines.append((name, 'recursive', game, recursive_move))
+        engines.append((name, 'iterative', game, game.move))
+
+    print('{0:>10} {1:>10} {2:>5} {3:>10} {4:>14}'.format('package', 'engine', 'disks', 'seconds', 'moves/second'))
+    for disk_count in disk_counts:
+        move_count = 2 ** disk_count - 1
+        for name, engine, game, move in engines:
+            seconds = time_move(move, game, disk_count)
+            print('{0:>10} {1:>10} {2:>5} {3:>10.3f} {4:>14.0f}'.format(name, engine, disk_count, seconds, move_count / seconds))
+
+def create_suite_cases(module, disk_count):
+    '''
+    Returns the suite cases for the specified implementation and disk count.
+
+    Each case is a tuple containing the operation name, an indication of
+    whether a callback is used, the count of operations performed by each run
+    (pegs created or disks moved), an indication of whether a run may be
+    repeated with the same arguments, a function that prepares the arguments
+    of a run, and a function that performs a run.
+    '''
+
+    game = module.Game()
+    move_count = 2 ** disk_count - 1
+
+    def prepare_move():
+        return (game.create_peg('A', disk_count), game.create_peg('C'), game.create_peg('B'))
+
+    return [
+        ('create_peg', False, 1, True, lambda: None, lambda _: game.create_peg('A', disk_count)),
+        ('move', False, move_count, False, prepare_move, lambda pegs: game.move(disk_count, *pegs)),
+        ('move', True, move_count, False, prepare_move, lambda pegs: game.move(disk_count, *pegs, ignore_pegs))
+    ]
+
+def measure_suite_case(operation_count, repeatable, prepare, run):
+    '''
+    Returns the measurements of a single suite case as a dictionary.
+
+    Runs are timed without tracing, and the time reported is the least of the
+    timings made over at least `_MIN_TIMING_SECONDS` (and at least
+    `_MIN_TIMING_COUNT` timings) so that it is stable enough to compare with a
+    baseline.  A repeatable run is timed in a loop, and each timing of any
+    other run uses fresh arguments.  A separate traced run measures the peak
+    and retained memory.  CPython does not count allocations cumulatively, so
+    the net count of allocations (the count of memory blocks allocated during
+    the run less those freed) is reported as `net_allocations` instead.
+    '''
+
+    timings = []
+    start_time = time.perf_counter()
+    while (len(timings) < _MIN_TIMING_COUNT) or (time.perf_counter() - start_time < _MIN_TIMING_SECONDS):
+        arguments = prepare()
+        if repeatable:
+            run_count, seconds = timeit.Timer(lambda: run(arguments)).autorange()
+            timings.append(seconds / run_count)
+        else:
+            run_start_time = time.perf_counter()
+            run(arguments)
+            timings.append(time.perf_counter() - run_start_time)
+    seconds = min(timings)
+
+    arguments = prepare()
+    tracemalloc.start()
+    try:
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        start_snapshot = tracemalloc.take_snapshot()
+        result = run(arguments)
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        net_allocations = sum(statistic.count_diff for statistic in tracemalloc.take_snapshot().compare_to(start_snapshot, 'filename'))
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return {
+        'seconds': seconds,
+        'operations_per_second': operation_count / seconds,
+        'peak_bytes': peak_bytes - start_bytes,
+        'retained_bytes': current_bytes - start_bytes,
+        'net_allocations': net_allocations
+    }
+
+def run_suite(disk_counts):
+    '''
+    Runs the suite for both implementations, prints each result, and returns
+    the results as a list of dictionaries.
+    '''
+
+    results = []
+    print('{0:>10} {1:>10} {2:>8} {3:>5} {4:>12} {5:>14} {6:>12} {7:>12} {8:>10}'.format(
+        'package', 'operation', 'callback', 'disks', 'seconds', 'operations/s', 'peak bytes', 'retained', 'net allocs'
+    ))
+    for name in IMPLEMENTATION_NAMES:
+        module = load_implementation(name)
+        for disk_count in disk_counts:
+            for operation, callback, operation_count, repeatable, prepare, run in create_suite_cases(module, disk_count):
+                result = {'implementation': name, 'operation': operation, 'callback': callback, 'disk_count': disk_count}
+                result.update(measure_suite_case(operation_count, repeatable, prepare, run))
+                results.append(result)
+                print(
+                    '{implementation:>10} {operation:>10} {callback!s:>8} {disk_count:>5} {seconds:>12.6f} '
+                    '{operations_per_second:>14.0f} {peak_bytes:>12} {retained_bytes:>12} {net_allocations:>10}'.format(**result)
+                )
+    return results
+
+def find_regressions(results, baseline_results, threshold):
+    '''
+    Returns the `(result, baseline_result)` pairs in which the time of the
+    result exceeds that of the matching baseline result by more than the
+    specified fraction.  Results without a matching baseline result are
+    ignored.
+    '''
+
+    def key(result):
+        return (result['implementation'], result['operation'], result['callback'], result['disk_count'])
+
+    baseline_results_by_key = {key(result): result for result in baseline_results}
+    return [
+        (result, baseline_results_by_key[key(result)])
+        for result in results
+        if (key(result) in baseline_results_by_key) and (result['seconds'] > baseline_results_by_key[key(result)]['seconds'] * (1 + threshold))
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks the Tower of Hanoi solutions.')
+    parser.add_argument('min_disk_count', nargs='?', type=int, help='the smallest disk count (default: 10, or 20 with --engines)')
+    parser.add_argument('max_disk_count', nargs='?', type=int, help='the largest disk count (default: 18, 16 with --allocations, or 25 with --engines)')
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument('--allocations', action='store_true', help='compare the bytes allocated per move by the list-backed and persistent functional pegs')
+    mode_group.add_argument('--engines', action='store_true', help='compare the recursive and iterative Game.move engines')
+    parser.add_argument('--output', metavar='FILE', help='write the suite results to FILE as JSON')
+    parser.add_argument('--baseline', metavar='FILE', help='compare the suite results with the JSON results in FILE and fail on regressions')
+    parser.add_argument('--threshold', type=float, default=0.1, help='the fraction by which a time may exceed its baseline before it is a regression (default: 0.1)')
+    args = parser.parse_args()
+
+    # Every state of an allocations run is retained while it is traced, so
+    # its memory grows with the move count.
+    if args.allocations:
+        default_disk_counts = (10, 16)
+    elif args.engines:
+        default_disk_counts = (20, 25)
+    else:
+        default_disk_counts = (10, 18)
+    min_disk_count = default_disk_counts[0] if args.min_disk_count is None else args.min_disk_count
+    max_disk_count = max(min_disk_count, default_disk_counts[1]) if args.max_disk_count is None else args.max_disk_count
+    assert 0 < min_disk_count <= max_disk_count
+    assert args.threshold >= 0
+
+    disk_counts = range(min_disk_count, max_disk_count + 1)
+    if args.allocations:
+        print_allocations(disk_counts)
+        return 0
+    if args.engines:
+        print_move_times(disk_counts)
+        return 0
+
+    results = run_suite(disk_counts)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'python': platform.python_version(), 'results': results}, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline_results = json.load(file)['results']
+        regressions = find_regressions(results, baseline_results, args.threshold)
+        for result, baseline_result in regressions:
+            print('regression: {0} {1} (callback: {2}) with {3} disks took {4:.6f} s versus {5:.6f} s'.format(
+                result['implementation'], result['operation'], result['callback'], result['disk_count'], result['seconds'], baseline_result['seconds']
+            ))
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import collections
+import concurrent.futures
+import hashlib
+import os
+
+import solution_cache
+
+# The moves of each solution are solved in segments of `_SEGMENT_SIZE` moves,
+# which are spread across the workers, and the digest of a solution is that
+# of the concatenated digests of its segments.  So the digest does not depend
+# on the count of workers.
+_SEGMENT_SIZE = 1 << 20
+
+# The cache of each worker process, shared by all segments it solves.
+_worker_cache = None
+
+class BatchResult:
+    '''
+    The solution of one instance solved by `solve_batch`.
+
+    The digest identifies the moves of the solution in their compact form (see
+    `SolutionCache.moves`), which depends only on the disk count.  It is the
+    BLAKE2b digest of the BLAKE2b digests of the consecutive segments of
+    1048576 moves.
+    '''
+
+    def __init__(self, disk_count, names, digest, moves=None):
+        '''
+        Initializes a new instance of the `BatchResult` class.
+
+        :param disk_count: The count of disks moved.
+        :type disk_count: int
+        :param names: The sequence of the names of the source, destination, and
+            intermediate pegs.
+        :param digest: The hexadecimal digest of the compact moves.
+        :type digest: str
+        :param moves: The optional compact moves.  Defaults to `None`, in which
+            case the moves were not kept.
+        :type moves: bytes
+        '''
+
+        self._digest = digest
+        self._disk_count = disk_count
+        self._moves = moves
+        self._names = tuple(names)
+
+    def __repr__(self):
+        return 'BatchResult(disk_count={disk_count}, names={names}, digest={digest})'.format(
+            disk_count=self._disk_count,
+            names=self._names,
+            digest=self._digest
+        )
+
+    def digest(self):
+        '''
+        Returns the digest of the moves.
+
+        :returns: The hexadecimal digest of the compact moves.
+        '''
+
+        return self._digest
+
+    def disk_count(self):
+        '''
+        Returns the count of disks moved.
+
+        :returns: The count of disks moved.
+        '''
+
+        return self._disk_count
+
+    def iter_moves(self):
+        '''
+        Returns an iterator over the moves of the solution.
+
+        :returns: An iterator of `(disk_size, from_name, to_name)` tuples in
+            the same order as `Game.iter_moves`.
+
+        :raises: Exception - If the moves were not kept.
+        '''
+
+        if self._moves is None:
+            raise Exception('moves were not kept')
+
+        names = self._names
+        moves = [None if move is None else (names[move[0]], names[move[1]]) for move in solution_cache.MOVES]
+        return (
+            ((move_number & -move_number).bit_length(),) + moves[code]
+            for move_number, code in enumerate(self._moves, 1)
+        )
+
+    def move_count(self):
+        '''
+        Returns the count of moves of the solution.
+
+        :returns: The count of moves of the solution.
+        '''
+
+        return 2 ** self._disk_count - 1
+
+    def names(self):
+        '''
+        Returns the names of the source, destination, and intermediate pegs.
+
+        :returns: A tuple of the three peg names.
+        '''
+
+        return self._names
+
+def _initialize_worker(cache_size, block_disk_count):
+    global _worker_cache
+    _worker_cache = solution_cache.SolutionCache(cache_size, block_disk_count)
+
+def _iter_segments(disk_counts):
+    # Yields the `(disk_count, start, stop)` move ranges of the segments of
+    # the solutions for the specified counts of disks, in order.
+    for disk_count in disk_counts:
+        move_count = 2 ** disk_count - 1
+        for start in range(0, move_count, _SEGMENT_SIZE):
+            yield (disk_count, start, min(start + _SEGMENT_SIZE, move_count))
+
+def _iter_solved_segments(segments, max_workers, keep_moves, cache_size, block_disk_count):
+    # Yields the `(disk_count, solution)` pairs of the segments in order; see
+    # `_solve_segment`.  As in `render_parallel`, at most twice as many
+    # segments as there are workers are pending at any time.
+    if max_workers == 1:
+        cache = solution_cache.SolutionCache(cache_size, block_disk_count)
+        for disk_count, start, stop in segments:
+            yield (disk_count, _solve_segment(cache, disk_count, start, stop, keep_moves))
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers, initializer=_initialize_worker, initargs=(cache_size, block_disk_count)) as executor:
+        pending_segments = collections.deque()
+        max_pending_segment_count = 2 * max_workers
+        for disk_count, start, stop in segments:
+            if len(pending_segments) == max_pending_segment_count:
+                pending_disk_count, solution = pending_segments.popleft()
+                yield (pending_disk_count, solution.result())
+            pending_segments.append((disk_count, executor.submit(_solve_segment_in_worker, disk_count, start, stop, keep_moves)))
+        while pending_segments:
+            pending_disk_count, solution = pending_segments.popleft()
+            yield (pending_disk_count, solution.result())
+
+def _solve_segment(cache, disk_count, start, stop, keep_moves):
+    # Returns the digest and, if kept, the compact moves of the range of the
+    # solution for the specified count of disks, which do not depend on the
+    # peg names.
+    digest = hashlib.blake2b(digest_size=16)
+    blocks = []
+    for block in cache.iter_blocks(disk_count, start, stop):
+        digest.update(block)
+        if keep_moves:
+            blocks.append(block)
+    moves = b''.join(blocks) if keep_moves else None
+    return (digest.digest(), moves)
+
+def _solve_segment_in_worker(disk_count, start, stop, keep_moves):
+    return _solve_segment(_worker_cache, disk_count, start, stop, keep_moves)
+
+def solve_batch(specs, max_workers=None, keep_moves=False, cache_size=1 << 26, block_disk_count=16):
+    '''
+    Solves the specified instances of the game using a pool of worker
+    processes.
+
+    The solution of an instance depends only on its disk count, so each
+    distinct disk count is solved once and its solution is shared by all
+    instances with that count.  The solution for each disk count is split
+    into segments of consecutive moves, and the segments are solved by the
+    workers from the largest disk count down, so a single large disk count
+    keeps every worker busy.  Each worker process has its own
+    `SolutionCache`, which is shared by all segments it solves, so the
+    sequences of moves of smaller towers are only computed once per worker.
+
+    :param specs: The iterable of `(disk_count, source_name,
+        destination_name, intermediate_name)` tuples describing the instances;
+        each disk count must be positive and the names must be distinct.
+    :param max_workers: The count of worker processes.  Defaults to `None`, in
+        which case the count of processors is used.  If 1, the instances are
+        solved in the calling process.
+    :type max_workers: int
+    :param keep_moves: Indicates the moves of each instance should be
+        returned in compact form, one byte per move, so they may be iterated.
+        Defaults to `False`, in which case only a summary is returned.
+    :type keep_moves: bool
+    :param cache_size: The maximum count of bytes of the cache of each worker.
+        Defaults to 64 MiB.
+    :type cache_size: int
+    :param block_disk_count: The count of disks of the blocks from which the
+        cached solutions are composed.  Defaults to 16.
+    :type block_disk_count: int
+
+    :returns: A list of `BatchResult` in the same order as `specs`.
+    '''
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    assert max_workers > 0
+
+    specs = list(specs)
+    for disk_count, source_name, destination_name, intermediate_name in specs:
+        assert disk_count > 0
+        assert len({source_name, destination_name, intermediate_name}) == 3
+
+    disk_counts = sorted({spec[0] for spec in specs}, reverse=True)
+    digests_by_disk_count = {disk_count: [] for disk_count in disk_counts}
+    moves_by_disk_count = {disk_count: [] for disk_count in disk_counts}
+    segments = _iter_segments(disk_counts)
+    for disk_count, (digest, moves) in _iter_solved_segments(segments, max_workers, keep_moves, cache_size, block_disk_count):
+        digests_by_disk_count[disk_count].append(digest)
+        moves_by_disk_count[disk_count].append(moves)
+    solutions_by_disk_count = {
+        disk_count: (
+            hashlib.blake2b(b''.join(digests_by_disk_count[disk_count]), digest_size=16).hexdigest(),
+            b''.join(moves_by_disk_count[disk_count]) if keep_moves else None
+        )
+        for disk_count in disk_counts
+    }
+
+    return [BatchResult(spec[0], spec[1:], *solutions_by_disk_count[spec[0]]) for spec in specs]
@@ -0,0 +1,369 @@
+import os
+import struct
+import threading
+
+from tower_of_hanoi import Bitboard, Game
+
+# A checkpoint file contains a header with the magic bytes, the format
+# version, the disk count, and the count of moves performed, followed by the
+# names of the source, destination, and intermediate pegs, each prefixed by
+# its length in bytes, and the disk masks of those pegs after the moves, each
+# in `(disk_count + 7) // 8` bytes.  The state is derived from the move count,
+# so the masks are only used to detect a checkpoint that was not written for
+# the solution it claims to be for.
+_HEADER = struct.Struct('<4sBBQ')
+_MAGIC = b'HNCK'
+# The move count is stored in 64 bits, which holds every move count of at most
+# 64 disks.
+_MAX_DISK_COUNT = 64
+_NAME_LENGTH = struct.Struct('<H')
+_VERSION = 1
+
+class Checkpoint:
+    '''
+    The progress of the solution that moves a tower of disks from the source
+    peg to the destination peg.
+    '''
+
+    def __init__(self, disk_count, names, move_count):
+        '''
+        Initializes a new instance of the `Checkpoint` class.
+
+        :param disk_count: The count of disks to move; must be positive and not
+            exceed 64.
+        :type disk_count: int
+        :param names: The sequence of the names of the source, destination, and
+            intermediate pegs.
+        :param move_count: The count of moves performed; must not exceed
+            `2 ** disk_count - 1`.
+        :type move_count: int
+        '''
+
+        assert 0 < disk_count <= _MAX_DISK_COUNT
+        assert len(names) == 3
+        assert 0 <= move_count <= 2 ** disk_count - 1
+
+        self._disk_count = disk_count
+        self._move_count = move_count
+        self._names = tuple(names)
+
+    def __eq__(self, other):
+        if not isinstance(other, Checkpoint):
+            return NotImplemented
+        return (self._disk_count, self._names, self._move_count) == (other._disk_count, other._names, other._move_count)
+
+    def __repr__(self):
+        return 'Checkpoint(disk_count={disk_count}, names={names}, move_count={move_count})'.format(
+            disk_count=self._disk_count,
+            names=self._names,
+            move_count=self._move_count
+        )
+
+    def bitboard(self):
+        '''
+        Returns the state of the game after the moves performed.
+
+        :returns: The state of the game after the moves performed.
+        :rtype: Bitboard
+        '''
+
+        return Bitboard.from_pegs(Game().state_at(self._disk_count, self._move_count, *self._names))
+
+    def disk_count(self):
+        '''
+        Returns the count of disks to move.
+
+        :returns: The count of disks to move.
+        '''
+
+        return self._disk_count
+
+    def move_count(self):
+        '''
+        Returns the count of moves performed.
+
+        :returns: The count of moves performed.
+        '''
+
+        return self._move_count
+
+    def names(self):
+        '''
+        Returns the names of the source, destination, and intermediate pegs.
+
+        :returns: A tuple of the three peg names.
+        '''
+
+        return self._names
+
+class CheckpointWriter:
+    '''
+    Periodically saves the progress of a solution performed by `Game.move`.
+
+    The `record` method is passed as the callback of `Game.move`; it invokes
+    the wrapped callback and counts the moves, and a checkpoint is taken once
+    every `interval` moves.  Checkpoints are handed to a background thread
+    that writes them, so the moves never wait for a file to be written or
+    synchronized.  If a checkpoint is taken while the previous one is still
+    being written, only the latest checkpoint waiting is written.  The writer
+    must be closed to save a final checkpoint and stop the thread; it may be
+    used as a context manager, in which case it is closed on exit, even if the
+    moves were interrupted by an exception.
+    '''
+
+    def __init__(self, path, disk_count, names, callback=None, interval=1 << 24, start=0):
+        '''
+        Initializes a new instance of the `CheckpointWriter` class.
+
+        :param path: The path of the checkpoint file.
+        :type path: str
+        :param disk_count: The count of disks to move; must be positive and not
+            exceed 64.
+        :type disk_count: int
+        :param names: The sequence of the names of the source, destination, and
+            intermediate pegs.
+        :param callback: The optional callback invoked by `record` before the
+            move is counted.  Defaults to `None`.
+        :param interval: The count of moves between checkpoints; must be
+            positive.  Defaults to 16777216.
+        :type interval: int
+        :param start: The count of moves performed before the first move
+            recorded.  Defaults to 0.
+        :type start: int
+        '''
+
+        assert 0 < disk_count <= _MAX_DISK_COUNT
+        assert len(names) == 3
+        assert interval > 0
+        assert 0 <= start <= 2 ** disk_count - 1
+
+        self._callback = callback
+        self._condition = threading.Condition()
+        self._disk_count = disk_count
+        self._error = None
+        self._interval = interval
+        self._is_closed = False
+        self._is_saving = False
+        self._move_count = start
+        self._names = tuple(names)
+        self._next_move_count = start + interval
+        self._path = path
+        self._pending_checkpoint = None
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _hand_off(self):
+        # Hands a checkpoint of the moves performed to the saving thread,
+        # replacing any checkpoint it has not started to write.
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._save_pending_checkpoints, daemon=True)
+                self._thread.start()
+            self._pending_checkpoint = Checkpoint(self._disk_count, self._names, self._move_count)
+            self._condition.notify_all()
+        self._next_move_count = self._move_count + self._interval
+
+    def _save_pending_checkpoints(self):
+        # Runs on the saving thread until the writer is closed.  The first
+        # error is kept and raised by `flush`.
+        while True:
+            with self._condition:
+                while (self._pending_checkpoint is None) and not self._is_closed:
+                    self._condition.wait()
+                if self._pending_checkpoint is None:
+                    return
+                checkpoint = self._pending_checkpoint
+                self._pending_checkpoint = None
+                self._is_saving = True
+            error = None
+            try:
+                save_checkpoint(self._path, checkpoint)
+            except Exception as save_error:
+                error = save_error
+            with self._condition:
+                if self._error is None:
+                    self._error = error
+                self._is_saving = False
+                self._condition.notify_all()
+
+    def close(self):
+        '''
+        Saves a final checkpoint of the moves performed and stops the saving
+        thread.
+        '''
+
+        if self._is_closed:
+            return
+
+        try:
+            self.save()
+        finally:
+            with self._condition:
+                self._is_closed = True
+                self._condition.notify_all()
+            self._thread.join()
+
+    def flush(self):
+        '''
+        Waits until the checkpoints taken have been saved.
+
+        :raises: Exception - If a checkpoint could not be saved.
+        '''
+
+        with self._condition:
+            while (self._pending_checkpoint is not None) or self._is_saving:
+                self._condition.wait()
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def move_count(self):
+        '''
+        Returns the count of moves performed.
+
+        :returns: The count of moves performed, including those performed
+            before the first move recorded.
+        '''
+
+        return self._move_count
+
+    def record(self, pegs_or_move):
+        '''
+        Invokes the callback and counts the move, saving a checkpoint if the
+        interval has elapsed.
+
+        A move is only counted once the callback returns, so a solution
+        resumed from a checkpoint invokes the callback again for any move
+        whose callback was interrupted.
+
+        :param pegs_or_move: The argument passed by `Game.move` to its
+            callback.
+        '''
+
+        if self._callback is not None:
+            self._callback(pegs_or_move)
+        self._move_count += 1
+        if self._move_count == self._next_move_count:
+            self._hand_off()
+
+    def save(self):
+        '''
+        Saves a checkpoint of the moves performed and waits until it has been
+        saved.
+
+        :raises: Exception - If a checkpoint could not be saved.
+        '''
+
+        self._hand_off()
+        self.flush()
+
+def load_checkpoint(path):
+    '''
+    Loads the checkpoint from the specified file.
+
+    :param path: The path of the checkpoint file.
+    :type path: str
+
+    :returns: The checkpoint.
+    :rtype: Checkpoint
+
+    :raises: Exception - If the file is not a checkpoint or does not match the
+        solution it is for.
+    '''
+
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    try:
+        magic, version, disk_count, move_count = _HEADER.unpack_from(data, 0)
+        if (magic != _MAGIC) or (version != _VERSION):
+            raise Exception('file is not a checkpoint')
+        offset = _HEADER.size
+        names = []
+        for _ in range(3):
+            name_length, = _NAME_LENGTH.unpack_from(data, offset)
+            offset += _NAME_LENGTH.size
+            names.append(data[offset:offset + name_length].decode('utf-8'))
+            offset += name_length
+    except (struct.error, UnicodeDecodeError):
+        raise Exception('file is not a checkpoint')
+
+    mask_size = (disk_count + 7) // 8
+    if not (0 < disk_count <= _MAX_DISK_COUNT) or (move_count > 2 ** disk_count - 1) or (len(data) != offset + 3 * mask_size):
+        raise Exception('checkpoint is corrupt')
+    masks = [int.from_bytes(data[mask_offset:mask_offset + mask_size], 'little') for mask_offset in range(offset, len(data), mask_size)]
+    checkpoint = Checkpoint(disk_count, names, move_count)
+    if list(checkpoint.bitboard().masks()) != masks:
+        raise Exception('checkpoint is corrupt')
+    return checkpoint
+
+def resume(game, path, callback=None, events=False, interval=1 << 24):
+    '''
+    Resumes the solution saved in the specified checkpoint file.
+
+    The pegs are created in the state of the checkpoint, and the remaining
+    moves are performed by `Game.move`, which invokes the callback exactly as
+    it would have for those moves of the whole solution.  Checkpoints continue
+    to be saved to the file.
+
+    :param game: The game used to perform the moves.
+    :type game: Game
+    :param path: The path of the checkpoint file.
+    :type path: str
+    :param callback: The optional callback passed to `Game.move`.  Defaults to
+        `None`.
+    :param events: Indicates the callback should receive a `Move` rather than
+        the pegs.  Defaults to `False`.
+    :type events: bool
+    :param interval: The count of moves between checkpoints; must be positive.
+        Defaults to 16777216.
+    :type interval: int
+
+    :returns: A tuple containing the new source, destination, and
+        intermediate pegs that reflect the result of the moves.
+
+    :raises: Exception - If the file is not a checkpoint or does not match the
+        solution it is for.
+    '''
+
+    checkpoint = load_checkpoint(path)
+    disk_count, names, start = checkpoint.disk_count(), checkpoint.names(), checkpoint.move_count()
+    pegs = game.state_at(disk_count, start, *names)
+    with CheckpointWriter(path, disk_count, names, callback, interval, start) as writer:
+        return game.move(disk_count, *pegs, callback=writer.record, events=events, start=start)
+
+def save_checkpoint(path, checkpoint):
+    '''
+    Saves the specified checkpoint to the specified file.
+
+    The checkpoint is written to a temporary file that then replaces the
+    file, so the file always contains a complete checkpoint even if the
+    process is interrupted while saving.
+
+    :param path: The path of the checkpoint file.
+    :type path: str
+    :param checkpoint: The checkpoint to save.
+    :type checkpoint: Checkpoint
+    '''
+
+    disk_count = checkpoint.disk_count()
+    mask_size = (disk_count + 7) // 8
+    data = bytearray(_HEADER.pack(_MAGIC, _VERSION, disk_count, checkpoint.move_count()))
+    for name in checkpoint.names():
+        encoded_name = name.encode('utf-8')
+        data += _NAME_LENGTH.pack(len(encoded_name))
+        data += encoded_name
+    for mask in checkpoint.bitboard().masks():
+        data += mask.to_bytes(mask_size, 'little')
+
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
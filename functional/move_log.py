@@ -0,0 +1,230 @@
+import mmap
+import os
+import struct
+
+# A move log starts with a header containing the magic bytes, the format
+# version, the disk count, and the move count, followed by the three peg
+# names, each prefixed by its length in bytes.  The moves follow the header,
+# packed 3 bits per move, least significant bits first.  Each move is stored
+# as the index in `_PEG_INDEX_PAIRS` of its from and to peg indices; the disk
+# is not stored because it is derived from the move index.
+_HEADER = struct.Struct('<4sBBQ')
+_MAGIC = b'HNOI'
+_MOVE_COUNT_OFFSET = 6
+_NAME_LENGTH = struct.Struct('<H')
+_PEG_INDEX_PAIRS = ((0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1))
+_VERSION = 1
+
+# Moves are written and read in groups of 8 (24 bits, or 3 bytes).
+_GROUP_MOVE_COUNT = 8
+_GROUP_SIZE = 3
+
+class MoveLogWriter:
+    '''
+    Writes a packed binary log of the moves of a Tower of Hanoi game.
+
+    Each move takes 3 bits.  The writer may be used as a context manager, in
+    which case it is closed on exit.
+    '''
+
+    def __init__(self, path, disk_count, names, buffer_size=1 << 16):
+        '''
+        Initializes a new instance of the `MoveLogWriter` class and writes the
+        log header.
+
+        :param path: The path of the log file to create.
+        :type path: str
+        :param disk_count: The count of disks in the game; must be positive.
+        :type disk_count: int
+        :param names: The sequence of the three peg names.
+        :param buffer_size: The count of bytes buffered before they are written
+            to the file.  Defaults to 64 KiB.
+        :type buffer_size: int
+        '''
+
+        assert 0 < disk_count < 256
+        assert len(names) == 3
+
+        self._bit_count = 0
+        self._bits = 0
+        self._buffer = bytearray()
+        self._buffer_size = buffer_size
+        self._codes = {(names[from_index], names[to_index]): code for code, (from_index, to_index) in enumerate(_PEG_INDEX_PAIRS)}
+        self._file = open(path, 'wb')
+        self._move_count = 0
+
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, disk_count, 0))
+        for name in names:
+            encoded_name = name.encode('utf-8')
+            self._file.write(_NAME_LENGTH.pack(len(encoded_name)))
+            self._file.write(encoded_name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        '''
+        Writes any buffered moves and the final move count, and closes the
+        log file.
+        '''
+
+        if self._file.closed:
+            return
+
+        if self._bit_count > 0:
+            self._buffer += self._bits.to_bytes((self._bit_count + 7) // 8, 'little')
+        self._file.write(self._buffer)
+        self._file.seek(_MOVE_COUNT_OFFSET)
+        self._file.write(struct.pack('<Q', self._move_count))
+        self._file.close()
+
+    def record(self, move):
+        '''
+        Writes the specified move.
+
+        This method may be passed as the callback of `Game.move` when `events`
+        is `True`.
+
+        :param move: The move to write.
+        :type move: Move
+        '''
+
+        self.write(move.from_name(), move.to_name())
+
+    def write(self, from_name, to_name):
+        '''
+        Writes a move of a disk between the specified pegs.
+
+        :param from_name: The name of the peg from which the disk was moved.
+        :type from_name: str
+        :param to_name: The name of the peg to which the disk was moved.
+        :type to_name: str
+        '''
+
+        self._bits |= self._codes[(from_name, to_name)] << self._bit_count
+        self._bit_count += 3
+        self._move_count += 1
+        if self._bit_count == 3 * _GROUP_MOVE_COUNT:
+            self._buffer += self._bits.to_bytes(_GROUP_SIZE, 'little')
+            self._bits = 0
+            self._bit_count = 0
+            if len(self._buffer) >= self._buffer_size:
+                self._file.write(self._buffer)
+                self._buffer.clear()
+
+class MoveLogReader:
+    '''
+    Reads a packed binary log of the moves of a Tower of Hanoi game written by
+    `MoveLogWriter`.
+
+    The log file is memory-mapped rather than loaded, and supports random
+    access to its moves.  The disk of each move is derived from the move index
+    as in the solution computed by `Game`.  The reader may be used as a
+    context manager, in which case it is closed on exit.
+    '''
+
+    def __init__(self, path):
+        '''
+        Initializes a new instance of the `MoveLogReader` class.
+
+        :param path: The path of the log file to read.
+        :type path: str
+
+        :raises: Exception - If the file is not a move log or is truncated.
+        '''
+
+        with open(path, 'rb') as file:
+            # An empty file cannot be memory-mapped.
+            if os.fstat(file.fileno()).st_size < _HEADER.size:
+                raise Exception('file is not a move log')
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._read_header()
+        except Exception:
+            self._mmap.close()
+            raise
+
+        self._moves = tuple((self._names[from_index], self._names[to_index]) for from_index, to_index in _PEG_INDEX_PAIRS)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getitem__(self, move_index):
+        if move_index < 0:
+            move_index += self._move_count
+        if not 0 <= move_index < self._move_count:
+            raise IndexError('move log index out of range')
+
+        bit_offset = 3 * move_index
+        byte_offset = self._data_offset + (bit_offset >> 3)
+        bits = int.from_bytes(self._mmap[byte_offset:byte_offset + 2], 'little')
+        move_number = move_index + 1
+        return ((move_number & -move_number).bit_length(),) + self._moves[(bits >> (bit_offset & 7)) & 7]
+
+    def __iter__(self):
+        moves = self._moves
+        move_number = 0
+        for group_offset in range(self._data_offset, self._data_offset + (3 * self._move_count + 7) // 8, _GROUP_SIZE):
+            bits = int.from_bytes(self._mmap[group_offset:group_offset + _GROUP_SIZE], 'little')
+            for _ in range(min(_GROUP_MOVE_COUNT, self._move_count - move_number)):
+                move_number += 1
+                yield ((move_number & -move_number).bit_length(),) + moves[bits & 7]
+                bits >>= 3
+
+    def __len__(self):
+        return self._move_count
+
+    def _read_header(self):
+        # Reads the header and checks the file is long enough to hold the
+        # names and moves it describes.
+        magic, version, self._disk_count, self._move_count = _HEADER.unpack_from(self._mmap, 0)
+        if (magic != _MAGIC) or (version != _VERSION):
+            raise Exception('file is not a move log')
+
+        offset = _HEADER.size
+        names = []
+        for _ in range(3):
+            if len(self._mmap) < offset + _NAME_LENGTH.size:
+                raise Exception('move log is truncated')
+            name_length, = _NAME_LENGTH.unpack_from(self._mmap, offset)
+            offset += _NAME_LENGTH.size
+            if len(self._mmap) < offset + name_length:
+                raise Exception('move log is truncated')
+            names.append(self._mmap[offset:offset + name_length].decode('utf-8'))
+            offset += name_length
+        if len(self._mmap) < offset + (3 * self._move_count + 7) // 8:
+            raise Exception('move log is truncated')
+        self._data_offset = offset
+        self._names = tuple(names)
+
+    def close(self):
+        '''
+        Closes the log file.
+        '''
+
+        self._mmap.close()
+
+    def disk_count(self):
+        '''
+        Returns the count of disks in the game.
+
+        :returns: The count of disks in the game.
+        '''
+
+        return self._disk_count
+
+    def names(self):
+        '''
+        Returns the peg names.
+
+        :returns: A tuple of the three peg names.
+        '''
+
+        return self._names
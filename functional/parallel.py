@@ -0,0 +1,75 @@
+import collections
+import concurrent.futures
+import io
+import os
+
+from tower_of_hanoi import Game
+
+def _render_chunk(renderer_class, every, disk_count, names, start, stop):
+    stream = io.StringIO()
+    renderer_class(stream, every).render(Game(), disk_count, *names, start, stop)
+    return stream.getvalue()
+
+def render_parallel(renderer_class, stream, disk_count, source_name, destination_name, intermediate_name, every=1, max_workers=None, chunk_size=1 << 20, start=0, stop=None):
+    '''
+    Renders the solution that moves the specified count of disks from the
+    source peg to the destination peg using a pool of worker processes.
+
+    The moves are split into chunks of consecutive move indices, and each
+    chunk is rendered independently by a worker process starting from the
+    state of the game at the start of the chunk.  The chunks are written to the
+    stream in order, so the output is identical to that of rendering the whole
+    solution in a single process.  At most twice as many chunks as there are
+    workers are pending at any time, which bounds the memory used when the
+    stream is slower than the workers.
+
+    :param renderer_class: The class of the renderer used to render each
+        chunk; the renderer is constructed with a text stream and `every`.
+    :param stream: The text stream to which the solution is written.
+    :param disk_count: The count of disks to move; must be positive.
+    :type disk_count: int
+    :param source_name: The name of the peg initially containing the disks.
+    :type source_name: str
+    :param destination_name: The name of the peg to which the disks will be
+        moved.
+    :type destination_name: str
+    :param intermediate_name: The name of the peg to be used to facilitate the
+        move according to the game rules.
+    :type intermediate_name: str
+    :param every: The sampling interval; only every `every`-th move is
+        rendered.  Must be positive.  Defaults to 1.
+    :type every: int
+    :param max_workers: The count of worker processes.  Defaults to `None`, in
+        which case the count of processors is used.
+    :type max_workers: int
+    :param chunk_size: The count of moves in each chunk; must be positive.
+        Defaults to 1048576.
+    :type chunk_size: int
+    :param start: The index of the first move to render.  Defaults to 0.
+    :type start: int
+    :param stop: The index *after* the last move to render.  Defaults to
+        `None`, in which case all remaining moves are rendered.
+    :type stop: int
+    '''
+
+    assert disk_count > 0
+    assert chunk_size > 0
+    move_count = 2 ** disk_count - 1
+    if stop is None:
+        stop = move_count
+    assert 0 <= start <= stop <= move_count
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    assert max_workers > 0
+
+    names = (source_name, destination_name, intermediate_name)
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        pending_chunks = collections.deque()
+        max_pending_chunk_count = 2 * max_workers
+        for chunk_start in range(start, stop, chunk_size):
+            if len(pending_chunks) == max_pending_chunk_count:
+                stream.write(pending_chunks.popleft().result())
+            pending_chunks.append(executor.submit(_render_chunk, renderer_class, every, disk_count, names, chunk_start, min(chunk_start + chunk_size, stop)))
+        while pending_chunks:
+            stream.write(pending_chunks.popleft().result())
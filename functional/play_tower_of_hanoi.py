@@ -1,28 +1,63 @@
 #!/usr/bin/env python3
 
+import argparse
+import os
 import sys
 
+from checkpoint import Checkpoint, load_checkpoint, save_checkpoint
+from parallel import render_parallel
+from renderer import RENDERERS
 from tower_of_hanoi import Game
 
-def print_peg(peg):
-    print('{0}: {1}'.format(peg.name(), ' - '.join([str(disk.size()) for disk in peg.disks()])))
-
-def print_pegs(pegs):
-    print('==========')
-    for peg in sorted(pegs, key=lambda peg: peg.name()):
-        print_peg(peg)
-
-if len(sys.argv) != 2:
-    print('Usage: {0} <disk_count>'.format(sys.argv[0]))
-    sys.exit(1)
-
-disk_count = int(sys.argv[1])
+parser = argparse.ArgumentParser(description='Solves the Tower of Hanoi puzzle for disks starting on peg A.')
+parser.add_argument('disk_count', type=int, help='the (positive) number of disks to start with on peg A')
+parser.add_argument('--format', choices=sorted(RENDERERS), default='text', help='the output format (default: text)')
+parser.add_argument('--every', type=int, default=1, metavar='N', help='render only every Nth move (default: 1)')
+parser.add_argument('--quiet', action='store_true', help='render only the final move')
+parser.add_argument('--workers', type=int, default=1, metavar='N', help='render using N worker processes (default: 1)')
+parser.add_argument('--checkpoint', metavar='FILE', help='save progress to FILE and resume from it if it exists')
+parser.add_argument('--checkpoint-every', type=int, default=2 ** 24, metavar='N', help='save progress every N moves (default: 16777216)')
+args = parser.parse_args()
+
+disk_count = args.disk_count
 assert disk_count > 0
-
-game = Game()
-peg_a = game.create_peg('A', disk_count)
-peg_b = game.create_peg('B')
-peg_c = game.create_peg('C')
-
-print_pegs([peg_a, peg_b, peg_c]) # display initial state
-game.move(disk_count, peg_a, peg_c, peg_b, print_pegs)
+every = 2 ** disk_count - 1 if args.quiet else args.every
+assert every > 0
+
+assert args.workers > 0
+assert args.checkpoint_every > 0
+
+def render(start=0, stop=None):
+    if args.workers == 1:
+        renderer = RENDERERS[args.format](sys.stdout, every)
+        renderer.render(Game(), disk_count, 'A', 'C', 'B', start, stop)
+    else:
+        render_parallel(RENDERERS[args.format], sys.stdout, disk_count, 'A', 'C', 'B', every, args.workers, start=start, stop=stop)
+
+# The output is often piped to a command such as `head` that exits early, so
+# a closed pipe ends the game quietly rather than with a traceback.
+try:
+    if args.checkpoint is None:
+        render()
+    else:
+        # The moves are rendered in ranges, and a checkpoint is saved once the
+        # output of each range has been flushed.
+        names = ('A', 'C', 'B')
+        start = 0
+        if os.path.exists(args.checkpoint):
+            checkpoint = load_checkpoint(args.checkpoint)
+            if (checkpoint.disk_count(), checkpoint.names()) != (disk_count, names):
+                parser.error('checkpoint is for another game')
+            start = checkpoint.move_count()
+        move_count = 2 ** disk_count - 1
+        for range_start in range(start, move_count, args.checkpoint_every):
+            range_stop = min(range_start + args.checkpoint_every, move_count)
+            render(range_start, range_stop)
+            sys.stdout.flush()
+            save_checkpoint(args.checkpoint, Checkpoint(disk_count, names, range_stop))
+    sys.stdout.flush()
+except BrokenPipeError:
+    # Python flushes stdout again at exit, so it is redirected to the null
+    # device to keep that flush from failing too.
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    sys.exit(1)
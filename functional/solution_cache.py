@@ -0,0 +1,209 @@
+import collections
+
+# Each move is stored as a single byte, `3 * from_peg + to_peg`, where the
+# pegs are identified by their index in `(source, destination, intermediate)`
+# order.  `MOVES` maps each code to the `(from_peg, to_peg, other_peg)`
+# indices of the move; the disk of a move is not stored because it is derived
+# from the move index.
+MOVES = tuple(
+    (code // 3, code % 3, 3 - code // 3 - code % 3) if code // 3 != code % 3 else None
+    for code in range(9)
+)
+
+# The `bytes.translate` tables that relabel the moves of a sequence from the
+# source peg to the destination peg, keyed by the new indices of the source
+# and destination pegs.  Each table replaces every peg index `p` of a move
+# with the `p`th new index.
+_RELABEL_TABLES = {
+    (source, destination): bytes(
+        3 * peg_indices[code // 3] + peg_indices[code % 3] if code < 9 else 0
+        for code in range(256)
+    )
+    for source, destination, peg_indices in (
+        (source, destination, (source, destination, 3 - source - destination))
+        for source in range(3)
+        for destination in range(3)
+        if source != destination
+    )
+}
+
+class SolutionCache:
+    '''
+    A bounded cache of the compact move sequences of Tower of Hanoi solutions.
+
+    The solution that moves `k` disks from one peg to another contains the
+    solution for `k - 1` disks twice, with the pegs relabeled.  So each
+    sequence is built by relabeling and concatenating cached sequences for one
+    fewer disk, and the solution for a large count of disks is produced as
+    cached blocks for `block_disk_count` disks separated by the moves of the
+    larger disks.  The least recently used sequences are evicted once the
+    cache holds more than `max_size` bytes.
+
+    A cache may be shared by many `Game` instances so that their solutions
+    reuse the same sequences.
+    '''
+
+    def __init__(self, max_size=1 << 26, block_disk_count=16):
+        '''
+        Initializes a new instance of the `SolutionCache` class.
+
+        :param max_size: The maximum count of bytes of the cached sequences;
+            must be positive.  Defaults to 64 MiB.
+        :type max_size: int
+        :param block_disk_count: The count of disks of the blocks from which
+            larger solutions are composed; must be positive.  Defaults to 16.
+        :type block_disk_count: int
+        '''
+
+        assert max_size > 0
+        assert block_disk_count > 0
+
+        self._block_disk_count = block_disk_count
+        self._hit_count = 0
+        self._max_size = max_size
+        self._miss_count = 0
+        self._sequences = collections.OrderedDict()
+        self._size = 0
+
+    def _store(self, key, sequence):
+        self._sequences[key] = sequence
+        self._size += len(sequence)
+        while self._size > self._max_size:
+            _, evicted_sequence = self._sequences.popitem(last=False)
+            self._size -= len(evicted_sequence)
+
+    def hit_count(self):
+        '''
+        Returns the count of sequences found in the cache.
+
+        :returns: The count of sequences found in the cache.
+        '''
+
+        return self._hit_count
+
+    def iter_blocks(self, disk_count, start=0, stop=None):
+        '''
+        Returns an iterator over blocks of the compact move sequence that
+        moves the specified count of disks from the source peg to the
+        destination peg.
+
+        The concatenation of the blocks is the range of the sequence returned
+        by `moves(disk_count, 0, 1)`, but no block is longer than the sequence
+        for `block_disk_count` disks, so any count of disks may be solved in
+        bounded memory.  Only the blocks overlapping the range are computed,
+        so ranges of a solution may be solved independently.
+
+        :param disk_count: The count of disks to move; must be positive.
+        :type disk_count: int
+        :param start: The index of the first move.  Defaults to 0.
+        :type start: int
+        :param stop: The index *after* the last move.  Defaults to `None`, in
+            which case all remaining moves are included.
+        :type stop: int
+
+        :returns: An iterator of non-empty `bytes` blocks.
+        '''
+
+        assert disk_count > 0
+        move_count = 2 ** disk_count - 1
+        if stop is None:
+            stop = move_count
+        assert 0 <= start <= stop <= move_count
+
+        if start == stop:
+            return
+        if disk_count <= self._block_disk_count:
+            sequence = self.moves(disk_count, 0, 1)
+            yield sequence if (start, stop) == (0, move_count) else sequence[start:stop]
+            return
+
+        # The smallest `block_disk_count` disks always move together as a
+        # tower between the moves of the larger disks, so the solution is that
+        # of a game with one disk per larger disk plus one disk standing for
+        # the tower, whose every move expands to a block.  The pegs of the
+        # moves of that game follow from the move number as in
+        # `Game._move_at`.  Each pair of a block and the following move of a
+        # larger disk spans `2 ** block_disk_count` moves, so the first block
+        # of the range follows from its start.
+        block_disk_count = self._block_disk_count
+        reduced_disk_count = disk_count - block_disk_count + 1
+        if reduced_disk_count % 2 == 0:
+            cycle = (0, 1, 2)
+        else:
+            cycle = (0, 2, 1)
+        pair_index = start >> block_disk_count
+        move_index = pair_index << block_disk_count
+        for move_number in range(2 * pair_index + 1, 1 << reduced_disk_count):
+            if move_index >= stop:
+                return
+            from_peg = cycle[(move_number & (move_number - 1)) % 3]
+            to_peg = cycle[((move_number | (move_number - 1)) + 1) % 3]
+            if move_number & 1:
+                block = self.moves(block_disk_count, from_peg, to_peg)
+            else:
+                block = bytes((3 * from_peg + to_peg,))
+            block_stop = move_index + len(block)
+            if (move_index < start) or (block_stop > stop):
+                block = block[max(start - move_index, 0):stop - move_index]
+            if block:
+                yield block
+            move_index = block_stop
+
+    def miss_count(self):
+        '''
+        Returns the count of sequences not found in the cache.
+
+        :returns: The count of sequences not found in the cache.
+        '''
+
+        return self._miss_count
+
+    def moves(self, disk_count, source, destination):
+        '''
+        Returns the compact move sequence that moves the specified count of
+        disks from the source peg to the destination peg.
+
+        :param disk_count: The count of disks to move; must be positive.
+        :type disk_count: int
+        :param source: The index of the peg containing the disks to move.
+        :type source: int
+        :param destination: The index of the peg to which the disks will be
+            moved; must not be the same as `source`.
+        :type destination: int
+
+        :returns: The `bytes` of the `2 ** disk_count - 1` move codes.
+        '''
+
+        assert disk_count > 0
+        assert (0 <= source <= 2) and (0 <= destination <= 2) and (source != destination)
+
+        key = (disk_count, source, destination)
+        sequence = self._sequences.get(key)
+        if sequence is not None:
+            self._hit_count += 1
+            self._sequences.move_to_end(key)
+            return sequence
+
+        self._miss_count += 1
+        if (source, destination) != (0, 1):
+            sequence = self.moves(disk_count, 0, 1).translate(_RELABEL_TABLES[(source, destination)])
+        elif disk_count == 1:
+            sequence = bytes((1,))
+        else:
+            smaller_sequence = self.moves(disk_count - 1, 0, 1)
+            sequence = b''.join((
+                smaller_sequence.translate(_RELABEL_TABLES[(0, 2)]),
+                bytes((1,)),
+                smaller_sequence.translate(_RELABEL_TABLES[(2, 1)])
+            ))
+        self._store(key, sequence)
+        return sequence
+
+    def size(self):
+        '''
+        Returns the count of bytes of the cached sequences.
+
+        :returns: The count of bytes of the cached sequences.
+        '''
+
+        return self._size
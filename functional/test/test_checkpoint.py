@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import unittest.mock as mock
+
+import checkpoint
+from checkpoint import Checkpoint, CheckpointWriter, load_checkpoint, resume, save_checkpoint
+from tower_of_hanoi import Game
+
+class CheckpointTestCase(unittest.TestCase):
+    def _format_move(self, move):
+        return (move.index(), move.disk().size(), move.from_name(), move.to_name())
+
+    def _solve(self, disk_count, callback):
+        game = Game()
+        game.move(disk_count, game.create_peg('a', disk_count), game.create_peg('c'), game.create_peg('b'), callback, events=True)
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, 'checkpoint.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test__load_checkpoint__returns_checkpoint_saved_by_save_checkpoint(self):
+        checkpoint = Checkpoint(40, ['a', 'c', 'b'], 123456789012)
+
+        save_checkpoint(self._path, checkpoint)
+
+        self.assertEqual(checkpoint, load_checkpoint(self._path))
+        self.assertFalse(os.path.exists(self._path + '.tmp'))
+
+    def test__load_checkpoint__when_disk_count_is_64__returns_checkpoint_saved_by_save_checkpoint(self):
+        checkpoint = Checkpoint(64, ['a', 'c', 'b'], 2 ** 64 - 1)
+
+        save_checkpoint(self._path, checkpoint)
+
+        self.assertEqual(checkpoint, load_checkpoint(self._path))
+
+    def test__load_checkpoint__when_file_is_not_checkpoint__raises_exception(self):
+        with open(self._path, 'wb') as file:
+            file.write(b'HNOI')
+
+        with self.assertRaises(Exception):
+            load_checkpoint(self._path)
+
+    def test__load_checkpoint__when_state_does_not_match_move_count__raises_exception(self):
+        save_checkpoint(self._path, Checkpoint(5, ['a', 'c', 'b'], 10))
+        with open(self._path, 'r+b') as file:
+            file.seek(6)
+            file.write(bytes((11,)))
+
+        with self.assertRaises(Exception):
+            load_checkpoint(self._path)
+
+    def test__writer__saves_checkpoint_every_interval_moves(self):
+        move_counts = []
+
+        def callback(move):
+            writer.flush()
+            if os.path.exists(self._path):
+                move_counts.append(load_checkpoint(self._path).move_count())
+
+        with CheckpointWriter(self._path, 5, ['a', 'c', 'b'], callback, interval=10) as writer:
+            self._solve(5, writer.record)
+
+        self.assertEqual([10, 20, 30], sorted(set(move_counts)))
+        self.assertEqual(31, load_checkpoint(self._path).move_count())
+
+    def test__writer__when_checkpoint_is_being_saved__does_not_block_moves(self):
+        is_saving = threading.Event()
+        is_released = threading.Event()
+        saved_move_counts = []
+
+        def save_checkpoint(path, checkpoint):
+            is_saving.set()
+            if checkpoint.move_count() < 31:
+                self.assertTrue(is_released.wait(10))
+            saved_move_counts.append(checkpoint.move_count())
+
+        with mock.patch.object(checkpoint, 'save_checkpoint', save_checkpoint):
+            with CheckpointWriter(self._path, 5, ['a', 'c', 'b'], interval=10) as writer:
+                self._solve(5, writer.record)
+                self.assertTrue(is_saving.wait(10))
+                self.assertEqual([], saved_move_counts)
+                is_released.set()
+
+        self.assertEqual(31, saved_move_counts[-1])
+        self.assertLessEqual(set(saved_move_counts), {10, 20, 30, 31})
+
+    def test__resume__when_moves_interrupted__invokes_callback_with_remaining_moves(self):
+        disk_count = 7
+        moves = []
+        self._solve(disk_count, lambda move: moves.append(self._format_move(move)))
+
+        def interrupt(move):
+            if move.index() == 50:
+                raise KeyboardInterrupt()
+
+        with self.assertRaises(KeyboardInterrupt):
+            with CheckpointWriter(self._path, disk_count, ['a', 'c', 'b'], interrupt, interval=16) as writer:
+                self._solve(disk_count, writer.record)
+        resumed_moves = []
+        pegs = resume(Game(), self._path, lambda move: resumed_moves.append(self._format_move(move)), events=True, interval=16)
+
+        self.assertEqual(moves[50:], resumed_moves)
+        self.assertEqual(Game().create_peg('c', disk_count), pegs[1])
+        self.assertEqual(127, load_checkpoint(self._path).move_count())
+
+    def test__resume__when_process_stopped_after_checkpoint__invokes_callback_with_remaining_pegs(self):
+        disk_count = 6
+        save_checkpoint(self._path, Checkpoint(disk_count, ['a', 'c', 'b'], 20))
+        states = []
+
+        resume(Game(), self._path, lambda pegs: states.append(sorted((peg.name(), [disk.size() for disk in peg.view()]) for peg in pegs)))
+
+        expected_states = [
+            sorted((peg.name(), [disk.size() for disk in peg.view()]) for peg in Game().state_at(disk_count, move_count, 'a', 'c', 'b'))
+            for move_count in range(21, 64)
+        ]
+        self.assertEqual(expected_states, states)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import io
+import json
+import unittest
+
+from renderer import CompactRenderer, JsonLinesRenderer, MoveRenderer, Renderer, TextRenderer
+from tower_of_hanoi import Game
+
+class RendererTestCase(unittest.TestCase):
+    def test____init____when_hooks_not_implemented__raises_type_error(self):
+        for renderer_class in (Renderer, MoveRenderer):
+            with self.subTest(renderer_class=renderer_class.__name__):
+                with self.assertRaises(TypeError):
+                    renderer_class(io.StringIO())
+
+class CompactRendererTestCase(unittest.TestCase):
+    def _render(self, disk_count, every=1):
+        stream = io.StringIO()
+        CompactRenderer(stream, every).render(Game(), disk_count, 'a', 'c', 'b')
+        return stream.getvalue()
+
+    def test__render__writes_each_move_on_one_line(self):
+        self.assertEqual('0 1 a b\n1 2 a c\n2 1 b c\n', self._render(2))
+
+    def test__render__when_every_is_2__writes_every_second_move(self):
+        self.assertEqual('1 2 a b\n3 3 a c\n5 2 b c\n', self._render(3, 2))
+
+    def test__render__when_disk_count_exceeds_block_disk_count__writes_each_move_on_one_line(self):
+        disk_count = CompactRenderer._BLOCK_DISK_COUNT + 2
+
+        expected_text = ''.join(
+            '{0} {1} {2} {3}\n'.format(move_index, disk_size, from_name, to_name)
+            for move_index, (disk_size, from_name, to_name) in enumerate(Game().iter_moves(disk_count, 'a', 'c', 'b'))
+        )
+        self.assertEqual(expected_text, self._render(disk_count))
+
+    def test__render__when_ranges_rendered_in_sequence__writes_same_text_as_whole_solution(self):
+        disk_count = CompactRenderer._BLOCK_DISK_COUNT + 2
+        stream = io.StringIO()
+        renderer = CompactRenderer(stream)
+
+        for start in range(0, 2 ** disk_count - 1, 1000):
+            renderer.render(Game(), disk_count, 'a', 'c', 'b', start, min(start + 1000, 2 ** disk_count - 1))
+
+        self.assertEqual(self._render(disk_count), stream.getvalue())
+
+class JsonLinesRendererTestCase(unittest.TestCase):
+    def _render(self, disk_count, every=1):
+        stream = io.StringIO()
+        JsonLinesRenderer(stream, every).render(Game(), disk_count, 'a', 'c', 'b')
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test__render__writes_each_move_as_json_object(self):
+        expected_moves = [
+            {'index': 0, 'disk': 1, 'from': 'a', 'to': 'b'},
+            {'index': 1, 'disk': 2, 'from': 'a', 'to': 'c'},
+            {'index': 2, 'disk': 1, 'from': 'b', 'to': 'c'}
+        ]
+        self.assertEqual(expected_moves, self._render(2))
+
+    def test__render__when_disk_count_exceeds_block_disk_count__writes_each_move_as_json_object(self):
+        disk_count = JsonLinesRenderer._BLOCK_DISK_COUNT + 1
+
+        expected_moves = [
+            {'index': move_index, 'disk': disk_size, 'from': from_name, 'to': to_name}
+            for move_index, (disk_size, from_name, to_name) in enumerate(Game().iter_moves(disk_count, 'a', 'c', 'b'))
+        ]
+        self.assertEqual(expected_moves, self._render(disk_count))
+
+class TextRendererTestCase(unittest.TestCase):
+    def _render(self, disk_count, every=1):
+        stream = io.StringIO()
+        TextRenderer(stream, every).render(Game(), disk_count, 'a', 'c', 'b')
+        return stream.getvalue()
+
+    def test__render__writes_initial_state_and_state_after_each_move(self):
+        expected_text = (
+            '==========\na: 2 - 1\nb: \nc: \n'
+            '==========\na: 2\nb: 1\nc: \n'
+            '==========\na: \nb: 1\nc: 2\n'
+            '==========\na: \nb: \nc: 2 - 1\n'
+        )
+        self.assertEqual(expected_text, self._render(2))
+
+    def test__render__when_every_is_3__writes_initial_state_and_state_after_every_third_move(self):
+        expected_text = (
+            '==========\na: 2 - 1\nb: \nc: \n'
+            '==========\na: \nb: \nc: 2 - 1\n'
+        )
+        self.assertEqual(expected_text, self._render(2, 3))
+
+    def test__render__when_start_is_not_0__writes_state_after_each_move_in_range(self):
+        stream = io.StringIO()
+
+        TextRenderer(stream).render(Game(), 2, 'a', 'c', 'b', 2, 3)
+
+        self.assertEqual('==========\na: \nb: \nc: 2 - 1\n', stream.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from timeline import Timeline
+from tower_of_hanoi import Disk, Game
+
+class TimelineTestCase(unittest.TestCase):
+    def _solve(self, disk_count):
+        game = Game()
+        pegs = (game.create_peg('a', disk_count), game.create_peg('c'), game.create_peg('b'))
+        timeline = Timeline(pegs)
+        game.move(disk_count, *pegs, callback=timeline.record)
+        return timeline
+
+    def test____getitem____returns_same_states_as_state_at(self):
+        disk_count = 5
+
+        timeline = self._solve(disk_count)
+
+        self.assertEqual(32, len(timeline))
+        for move_count in range(32):
+            with self.subTest(move_count=move_count):
+                self.assertEqual(Game().state_at(disk_count, move_count, 'a', 'c', 'b'), timeline[move_count])
+
+    def test__record__shares_unmoved_peg_with_previous_state(self):
+        timeline = self._solve(4)
+
+        for index in range(1, len(timeline)):
+            self.assertEqual(1, sum(peg is previous_peg for peg, previous_peg in zip(timeline[index], timeline[index - 1])))
+
+    def test__diff__when_states_are_adjacent__returns_moved_disk(self):
+        timeline = self._solve(3)
+
+        self.assertEqual([('a', [Disk(1)], []), ('c', [], [Disk(1)])], timeline.diff(0, 1))
+
+    def test__diff__returns_disks_to_move_between_states(self):
+        timeline = self._solve(4)
+
+        self.assertEqual(
+            [('a', [Disk(1), Disk(2)], [Disk(4), Disk(3)]), ('c', [Disk(4)], [Disk(2), Disk(1)]), ('b', [Disk(3)], [])],
+            timeline.diff(11, 3)
+        )
+
+    def test__diff__when_states_are_same__returns_no_differences(self):
+        timeline = self._solve(4)
+
+        self.assertEqual([], timeline.diff(7, 7))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+import unittest
+import unittest.mock as mock
+
+import vectorized
+from tower_of_hanoi import Game
+
+@unittest.skipUnless(vectorized.is_available(), 'numpy is not installed')
+class VectorizedTestCase(unittest.TestCase):
+    def test__iter_move_arrays__returns_same_moves_as_iter_moves(self):
+        disk_count = 7
+        moves = []
+
+        for start, disk_sizes, from_indices, to_indices in vectorized.iter_move_arrays(disk_count, block_size=10):
+            self.assertEqual(len(moves), start)
+            moves.extend(zip(disk_sizes.tolist(), from_indices.tolist(), to_indices.tolist()))
+
+        self.assertEqual(list(Game().iter_moves(disk_count, 0, 1, 2)), moves)
+
+    def test__iter_move_arrays__when_start_and_stop_specified__returns_moves_in_range(self):
+        blocks = list(vectorized.iter_move_arrays(3, 2, 5, block_size=2))
+
+        self.assertEqual([2, 4], [start for start, _, _, _ in blocks])
+        self.assertEqual([1, 3, 1], [disk_size for _, disk_sizes, _, _ in blocks for disk_size in disk_sizes.tolist()])
+
+    def test__move_arrays__when_disk_count_is_large__returns_same_moves_as_move_at(self):
+        disk_count = 40
+        move_indices = [0, 2 ** 39 - 1, 2 ** 40 - 2, 123456789012]
+
+        disk_sizes, from_indices, to_indices = vectorized.move_arrays(disk_count, move_indices)
+
+        expected_moves = [Game().move_at(disk_count, move_index, 0, 1, 2) for move_index in move_indices]
+        self.assertEqual(expected_moves, list(zip(disk_sizes.tolist(), from_indices.tolist(), to_indices.tolist())))
+
+    def test__move_arrays__when_move_index_out_of_range__raises_exception(self):
+        with self.assertRaises(Exception):
+            vectorized.move_arrays(2, [0, 3])
+
+    def test__moves_at__returns_same_moves_with_and_without_numpy(self):
+        disk_count = 9
+        move_indices = list(range(0, 2 ** disk_count - 1, 5))
+        moves = Game().moves_at(disk_count, move_indices, 'a', 'c', 'b')
+
+        with mock.patch.object(vectorized, 'numpy', None):
+            self.assertEqual(moves, Game().moves_at(disk_count, move_indices, 'a', 'c', 'b'))
+
+class VectorizedWithoutNumpyTestCase(unittest.TestCase):
+    def test__import__does_not_import_numpy(self):
+        code = 'import sys; import tower_of_hanoi; sys.exit(1 if "numpy" in sys.modules else 0)'
+
+        self.assertEqual(0, subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).returncode)
+
+    def test__move_arrays__when_numpy_not_installed__raises_exception(self):
+        with mock.patch.object(vectorized, 'numpy', None):
+            with self.assertRaises(Exception):
+                vectorized.move_arrays(2, [0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+class Timeline:
+    '''
+    A timeline of every state of the pegs of a Tower of Hanoi game.
+
+    Each state is a tuple of the three pegs produced by a move.  Because pegs
+    are persistent, a state shares the unmoved peg and all but the top cell of
+    the moved pegs with the previous state, so recording a state takes
+    constant memory regardless of the disk count.
+    '''
+
+    def __init__(self, pegs):
+        '''
+        Initializes a new instance of the `Timeline` class.
+
+        :param pegs: The sequence of the three pegs in the initial state.  The
+            states are tuples of pegs in the same order.
+        '''
+
+        assert len(pegs) == 3
+
+        self._peg_indices = {peg.name(): peg_index for peg_index, peg in enumerate(pegs)}
+        self._states = [tuple(pegs)]
+
+    def __getitem__(self, index):
+        return self._states[index]
+
+    def __len__(self):
+        return len(self._states)
+
+    def diff(self, index_a, index_b):
+        '''
+        Returns the differences between the pegs of the specified states.
+
+        The pegs are compared by walking their cells down to the cells they
+        share, so the cost is proportional to the count of disks that differ
+        rather than to the disk count.
+
+        :param index_a: The index of the first state.
+        :type index_a: int
+        :param index_b: The index of the second state.
+        :type index_b: int
+
+        :returns: A list of `(name, popped_disks, pushed_disks)` tuples, in the
+            order of the pegs of the states, for each peg that differs; see
+            `Peg.diff`.
+        '''
+
+        differences = []
+        for peg_a, peg_b in zip(self._states[index_a], self._states[index_b]):
+            if peg_a is not peg_b:
+                popped_disks, pushed_disks = peg_a.diff(peg_b)
+                if popped_disks or pushed_disks:
+                    differences.append((peg_a.name(), popped_disks, pushed_disks))
+        return differences
+
+    def record(self, pegs):
+        '''
+        Records the state following a move.
+
+        This method may be passed as the callback of `Game.move` when `events`
+        is `False`.
+
+        :param pegs: The sequence of the pegs changed by the move, in any
+            order.
+        '''
+
+        state = list(self._states[-1])
+        peg_indices = self._peg_indices
+        for peg in pegs:
+            state[peg_indices[peg.name()]] = peg
+        self._states.append(tuple(state))
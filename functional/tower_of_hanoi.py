@@ -1,11 +1,25 @@
+import asyncio
+import functools
+import time
+
+import solution_cache
+import vectorized
+
 class Disk:
     '''
     A disk in the Tower of Hanoi game.
+
+    Disks are immutable and interned, so all disks of the same size are the
+    same instance.
     '''
 
-    def __init__(self, size):
+    __slots__ = ('_size',)
+
+    _instances = {}
+
+    def __new__(cls, size):
         '''
-        Initializes a new instance of the `Disk` class.
+        Returns the instance of the `Disk` class with the specified size.
 
         :param size: The size of the disk; must be positive.
         :type size: int
@@ -13,14 +27,25 @@ class Disk:
 
         assert size > 0
 
-        self._size = size
+        disk = cls._instances.get(size)
+        if disk is None:
+            disk = super().__new__(cls)
+            disk._size = size
+            disk = cls._instances.setdefault(size, disk)
+        return disk
 
     def __eq__(self, other):
-        return self._size == other._size
+        return (self is other) or (self._size == other._size)
+
+    def __hash__(self):
+        return hash(self._size)
 
     def __lt__(self, other):
         return self._size < other._size
 
+    def __reduce__(self):
+        return (Disk, (self._size,))
+
     def __repr__(self):
         return 'Disk(size={size})'.format(size=self._size)
 
@@ -38,6 +63,11 @@ class Peg:
     A peg upon which disks are stacked in the Tower of Hanoi game.
 
     Disks may only be stacked in order of decreasing size.
+
+    The disks are held in a persistent singly-linked list whose cells are
+    `(disk, next_cell)` tuples linked from the top disk down to the bottom
+    disk.  Pushing or popping a disk creates a single cell at most, and the
+    new peg shares all remaining cells with the original peg.
     '''
 
     def __init__(self, name, disks=[]):
@@ -49,20 +79,84 @@ class Peg:
             bottom to top.  Defaults to an empty sequence.
         '''
 
-        self._disks = disks[:]
+        top_cell = None
+        disk_count = 0
+        for disk in disks:
+            top_cell = (disk, top_cell)
+            disk_count += 1
+        self._disk_count = disk_count
         self._name = name
+        self._top_cell = top_cell
 
     def __eq__(self, other):
-        return (self._name == other._name) and (self._disks == other._disks)
+        if (self._name != other._name) or (self._disk_count != other._disk_count):
+            return False
+
+        cell, other_cell = self._top_cell, other._top_cell
+        while cell is not other_cell:
+            if (cell is None) or (other_cell is None) or (cell[0] != other_cell[0]):
+                return False
+            cell, other_cell = cell[1], other_cell[1]
+        return True
 
     def __repr__(self):
-        return 'Peg(name={name}, disks={disks})'.format(name=self._name, disks=self._disks)
+        return 'Peg(name={name}, disks={disks})'.format(name=self._name, disks=self.disks())
+
+    @classmethod
+    def _from_top_cell(cls, name, top_cell, disk_count):
+        peg = cls.__new__(cls)
+        peg._disk_count = disk_count
+        peg._name = name
+        peg._top_cell = top_cell
+        return peg
 
     def _is_smaller_than_top_disk(self, disk):
         return True if self.is_empty() else disk < self._peek()
 
     def _peek(self):
-        return self._disks[-1]
+        return self._top_cell[0]
+
+    def diff(self, other):
+        '''
+        Returns the disks that must be popped from this peg, and then pushed
+        onto it, for it to hold the same disks as the other peg.
+
+        Only the disks above the cells shared by both pegs are visited, so the
+        cost is proportional to the count of disks that differ when the other
+        peg was derived from this peg by pushing and popping, or vice versa.
+
+        :param other: The other peg.
+        :type other: Peg
+
+        :returns: A tuple containing the list of disks to pop, ordered from top
+            to bottom, and the list of disks to push, ordered from bottom to
+            top.
+        '''
+
+        cell, disk_count = self._top_cell, self._disk_count
+        other_cell, other_disk_count = other._top_cell, other._disk_count
+        popped_disks = []
+        pushed_disks = []
+        while disk_count > other_disk_count:
+            popped_disks.append(cell[0])
+            cell = cell[1]
+            disk_count -= 1
+        while other_disk_count > disk_count:
+            pushed_disks.append(other_cell[0])
+            other_cell = other_cell[1]
+            other_disk_count -= 1
+        while cell is not other_cell:
+            popped_disks.append(cell[0])
+            pushed_disks.append(other_cell[0])
+            cell, other_cell = cell[1], other_cell[1]
+
+        # Equal disks in distinct cells at the bottom of both lists need not
+        # be moved.
+        while popped_disks and pushed_disks and (popped_disks[-1] == pushed_disks[-1]):
+            popped_disks.pop()
+            pushed_disks.pop()
+        pushed_disks.reverse()
+        return (popped_disks, pushed_disks)
 
     def disks(self):
         '''
@@ -71,7 +165,13 @@ class Peg:
         :returns: A sequence of disks on the peg ordered from bottom to top.
         '''
 
-        return self._disks[:]
+        disks = []
+        cell = self._top_cell
+        while cell is not None:
+            disks.append(cell[0])
+            cell = cell[1]
+        disks.reverse()
+        return disks
 
     def is_empty(self):
         '''
@@ -80,7 +180,7 @@ class Peg:
         :returns: `True` if the peg is empty; otherwise `False`.
         '''
 
-        return len(self._disks) == 0
+        return self._top_cell is None
 
     def name(self):
         '''
@@ -104,7 +204,7 @@ class Peg:
         if self.is_empty():
             raise Exception('peg is empty')
 
-        return (Peg(self._name, self._disks[0:-1]), self._peek())
+        return (Peg._from_top_cell(self._name, self._top_cell[1], self._disk_count - 1), self._peek())
 
     def push(self, disk):
         '''
@@ -121,13 +221,762 @@ class Peg:
         if not self._is_smaller_than_top_disk(disk):
             raise Exception('disk must be smaller than top disk')
 
-        return Peg(self._name, self._disks + [disk])
+        return Peg._from_top_cell(self._name, (disk, self._top_cell), self._disk_count + 1)
+
+    def view(self):
+        '''
+        Returns a read-only view of the disks on the peg ordered from bottom to
+        top.
+
+        Unlike `disks`, the view does not copy the disks.
+
+        :returns: A read-only view of the disks on the peg.
+        '''
+
+        return PegView(self._top_cell, self._disk_count)
+
+class PegView:
+    '''
+    A read-only view of the disks on a peg ordered from bottom to top.
+
+    The view shares the linked cells of the peg rather than copying its disks.
+    Because the cells are linked from the top disk down, `top`, `__len__` and
+    `__reversed__` are the cheapest operations; iterating from the bottom
+    first gathers the cells.
+    '''
+
+    __slots__ = ('_disk_count', '_top_cell')
+
+    def __init__(self, top_cell, disk_count):
+        '''
+        Initializes a new instance of the `PegView` class.
+
+        :param top_cell: The cell of the top disk on the peg.
+        :param disk_count: The count of disks on the peg.
+        :type disk_count: int
+        '''
+
+        self._disk_count = disk_count
+        self._top_cell = top_cell
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+
+        if index < 0:
+            index += self._disk_count
+        if not 0 <= index < self._disk_count:
+            raise IndexError('peg view index out of range')
+
+        cell = self._top_cell
+        for _ in range(self._disk_count - 1 - index):
+            cell = cell[1]
+        return cell[0]
+
+    def __iter__(self):
+        cells = []
+        cell = self._top_cell
+        while cell is not None:
+            cells.append(cell)
+            cell = cell[1]
+        return (cell[0] for cell in reversed(cells))
+
+    def __len__(self):
+        return self._disk_count
+
+    def __repr__(self):
+        return 'PegView(disks={disks})'.format(disks=list(self))
+
+    def __reversed__(self):
+        cell = self._top_cell
+        while cell is not None:
+            yield cell[0]
+            cell = cell[1]
+
+    def top(self):
+        '''
+        Returns the disk at the top of the peg.
+
+        :returns: The disk at the top of the peg.
+
+        :raises: Exception - If the peg is empty.
+        '''
+
+        if self._top_cell is None:
+            raise Exception('peg is empty')
+
+        return self._top_cell[0]
+
+class Bitboard:
+    '''
+    A compact, immutable state of the three pegs in the Tower of Hanoi game.
+
+    The disks on each peg are held in an integer mask in which bit `size - 1`
+    is set when the disk of that size is on the peg.  The top disk of a peg is
+    therefore the lowest set bit of its mask.
+    '''
+
+    __slots__ = ('_masks', '_names')
+
+    def __init__(self, names, masks):
+        '''
+        Initializes a new instance of the `Bitboard` class.
+
+        :param names: The sequence of the three peg names.
+        :param masks: The sequence of the three peg disk masks in the same
+            order as `names`; no disk may be on more than one peg.
+        '''
+
+        assert len(names) == 3
+        assert len(masks) == 3
+        assert (masks[0] & masks[1]) == (masks[0] & masks[2]) == (masks[1] & masks[2]) == 0
+
+        self._masks = tuple(masks)
+        self._names = tuple(names)
+
+    def __eq__(self, other):
+        return (self._names == other._names) and (self._masks == other._masks)
+
+    def __hash__(self):
+        return hash((self._names, self._masks))
+
+    def __repr__(self):
+        return 'Bitboard(names={names}, masks={masks})'.format(names=self._names, masks=self._masks)
+
+    @classmethod
+    def _from_masks(cls, names, masks):
+        bitboard = cls.__new__(cls)
+        bitboard._masks = masks
+        bitboard._names = names
+        return bitboard
+
+    @classmethod
+    def from_pegs(cls, pegs):
+        '''
+        Returns a new state equivalent to the specified pegs.
+
+        :param pegs: The sequence of the three pegs.
+
+        :returns: A new state.
+        '''
+
+        return cls(
+            [peg.name() for peg in pegs],
+            [sum(1 << (disk.size() - 1) for disk in peg.disks()) for peg in pegs]
+        )
+
+    def masks(self):
+        '''
+        Returns the peg disk masks.
+
+        :returns: A tuple of the peg disk masks in the same order as `names`.
+        '''
+
+        return self._masks
+
+    def move(self, from_name, to_name):
+        '''
+        Moves the top disk of one peg to the top of another peg.
+
+        :param from_name: The name of the peg from which the disk is removed.
+        :type from_name: str
+        :param to_name: The name of the peg to which the disk is added.
+        :type to_name: str
+
+        :returns: A new state reflecting the move.
+
+        :raises: Exception - If the from peg is empty or if the disk is not
+            smaller than the top disk of the to peg.
+        '''
+
+        from_index = self._names.index(from_name)
+        to_index = self._names.index(to_name)
+        from_mask = self._masks[from_index]
+        to_mask = self._masks[to_index]
+        if from_mask == 0:
+            raise Exception('peg is empty')
+
+        disk_bit = from_mask & -from_mask
+        if to_mask and ((to_mask & -to_mask) < disk_bit):
+            raise Exception('disk must be smaller than top disk')
+
+        masks = list(self._masks)
+        masks[from_index] = from_mask ^ disk_bit
+        masks[to_index] = to_mask | disk_bit
+        return Bitboard._from_masks(self._names, tuple(masks))
+
+    def names(self):
+        '''
+        Returns the peg names.
+
+        :returns: A tuple of the peg names.
+        '''
+
+        return self._names
+
+    def to_pegs(self):
+        '''
+        Returns new pegs equivalent to this state.
+
+        :returns: A tuple of new pegs in the same order as `names`.
+        '''
+
+        return tuple(
+            Peg(name, [Disk(disk_size) for disk_size in range(mask.bit_length(), 0, -1) if (mask >> (disk_size - 1)) & 1])
+            for name, mask in zip(self._names, self._masks)
+        )
+
+class Move:
+    '''
+    An immutable record of a single disk move in the Tower of Hanoi game.
+    '''
+
+    __slots__ = ('_disk', '_from_name', '_index', '_to_name')
+
+    def __init__(self, index, disk, from_name, to_name):
+        '''
+        Initializes a new instance of the `Move` class.
+
+        :param index: The zero-based index of the move.
+        :type index: int
+        :param disk: The disk that was moved.
+        :type disk: Disk
+        :param from_name: The name of the peg from which the disk was moved.
+        :type from_name: str
+        :param to_name: The name of the peg to which the disk was moved.
+        :type to_name: str
+        '''
+
+        self._disk = disk
+        self._from_name = from_name
+        self._index = index
+        self._to_name = to_name
+
+    def __eq__(self, other):
+        return (self._index == other._index) and (self._disk == other._disk) and (self._from_name == other._from_name) and (self._to_name == other._to_name)
+
+    def __hash__(self):
+        return hash((self._index, self._disk, self._from_name, self._to_name))
+
+    def __repr__(self):
+        return 'Move(index={index}, disk={disk}, from_name={from_name}, to_name={to_name})'.format(index=self._index, disk=self._disk, from_name=self._from_name, to_name=self._to_name)
+
+    def disk(self):
+        '''
+        Returns the disk that was moved.
+
+        :returns: The disk that was moved.
+        '''
+
+        return self._disk
+
+    def from_name(self):
+        '''
+        Returns the name of the peg from which the disk was moved.
+
+        :returns: The name of the peg from which the disk was moved.
+        '''
+
+        return self._from_name
+
+    def index(self):
+        '''
+        Returns the zero-based index of the move.
+
+        :returns: The zero-based index of the move.
+        '''
+
+        return self._index
+
+    def to_name(self):
+        '''
+        Returns the name of the peg to which the disk was moved.
+
+        :returns: The name of the peg to which the disk was moved.
+        '''
+
+        return self._to_name
+
+class Metrics:
+    '''
+    Counters of the work performed by a Tower of Hanoi game.
+
+    Metrics are only collected by a `Game` initialized with a `Metrics`
+    instance.  They cover `Game.create_peg` and `Game.move`.
+
+    `Game.move` does not instrument its engines, so the pushes, pops, and
+    pegs of its moves are not counted where they happen; they are derived
+    from the count of moves, each of which pops and pushes exactly one disk
+    and so creates two pegs.
+    '''
+
+    def __init__(self):
+        '''
+        Initializes a new instance of the `Metrics` class with all counters set
+        to zero.
+        '''
+
+        self.reset()
+
+    def __repr__(self):
+        return (
+            'Metrics(move_count={0}, push_count={1}, pop_count={2}, peg_count={3}, callback_count={4}, callback_seconds={5}, engine_seconds={6})'
+        ).format(self._move_count, self._push_count, self._pop_count, self._peg_count, self._callback_count, self._callback_seconds, self._engine_seconds)
+
+    def _record(self, move_count=0, push_count=0, pop_count=0, peg_count=0, callback_count=0, callback_seconds=0.0, engine_seconds=0.0):
+        self._callback_count += callback_count
+        self._callback_seconds += callback_seconds
+        self._engine_seconds += engine_seconds
+        self._move_count += move_count
+        self._peg_count += peg_count
+        self._pop_count += pop_count
+        self._push_count += push_count
+
+    def callback_count(self):
+        '''
+        Returns the count of callback invocations.
+
+        :returns: The count of callback invocations.
+        '''
+
+        return self._callback_count
+
+    def callback_seconds(self):
+        '''
+        Returns the cumulative time spent in callbacks.
+
+        :returns: The cumulative time spent in callbacks, in seconds.
+        '''
+
+        return self._callback_seconds
+
+    def engine_seconds(self):
+        '''
+        Returns the cumulative time spent moving disks, excluding the time
+        spent in callbacks.
+
+        :returns: The cumulative time spent moving disks, in seconds.
+        '''
+
+        return self._engine_seconds
+
+    def move_count(self):
+        '''
+        Returns the count of disks moved.
+
+        :returns: The count of disks moved.
+        '''
+
+        return self._move_count
+
+    def peg_count(self):
+        '''
+        Returns the count of pegs created, including the two pegs created by
+        the push and pop of each move counted.
+
+        :returns: The count of pegs created.
+        '''
+
+        return self._peg_count
+
+    def pop_count(self):
+        '''
+        Returns the count of disks popped from pegs, one per move counted.
+
+        :returns: The count of disks popped from pegs.
+        '''
+
+        return self._pop_count
+
+    def push_count(self):
+        '''
+        Returns the count of disks pushed onto pegs by `Game.create_peg` and
+        one per move counted.
+
+        :returns: The count of disks pushed onto pegs.
+        '''
+
+        return self._push_count
+
+    def reset(self):
+        '''
+        Sets all counters to zero.
+        '''
+
+        self._callback_count = 0
+        self._callback_seconds = 0.0
+        self._engine_seconds = 0.0
+        self._move_count = 0
+        self._peg_count = 0
+        self._pop_count = 0
+        self._push_count = 0
 
 class Game:
     '''
     Facade for the three-peg Tower of Hanoi game.
     '''
 
+    def __init__(self, metrics=None, cache=None):
+        '''
+        Initializes a new instance of the `Game` class.
+
+        :param metrics: The optional metrics updated by the game.  Defaults to
+            `None`, in which case no metrics are collected and the game runs
+            without instrumentation.
+        :type metrics: Metrics
+        :param cache: The optional cache of solutions used by `move`, which
+            may be shared with other games.  Defaults to `None`, in which case
+            each move is computed as it is performed.
+        :type cache: SolutionCache
+        '''
+
+        self._cache = cache
+        self._metrics = metrics
+
+    def _compare_states(self, bitboard_a, bitboard_b):
+        # Returns the peg names of the first state, the sizes of the disks in
+        # ascending order, the index in the names of the peg holding each disk
+        # in each state, and the rank (the one-based position in the sizes) of
+        # the largest disk on different pegs in the states, or 0 if none is.
+        names = bitboard_a.names()
+        masks_a = bitboard_a.masks()
+        masks_b_by_name = dict(zip(bitboard_b.names(), bitboard_b.masks()))
+        if sorted(names) != sorted(masks_b_by_name):
+            raise Exception('states must have the same pegs')
+        masks_b = [masks_b_by_name[name] for name in names]
+        disks_mask = masks_a[0] | masks_a[1] | masks_a[2]
+        if disks_mask != masks_b[0] | masks_b[1] | masks_b[2]:
+            raise Exception('states must hold the same disks')
+
+        disk_sizes = []
+        peg_indices_a = []
+        peg_indices_b = []
+        rank = 0
+        while disks_mask:
+            disk_bit = disks_mask & -disks_mask
+            disks_mask ^= disk_bit
+            disk_sizes.append(disk_bit.bit_length())
+            peg_indices_a.append(0 if masks_a[0] & disk_bit else 1 if masks_a[1] & disk_bit else 2)
+            peg_indices_b.append(0 if masks_b[0] & disk_bit else 1 if masks_b[1] & disk_bit else 2)
+            if peg_indices_a[-1] != peg_indices_b[-1]:
+                rank = len(disk_sizes)
+        return (names, disk_sizes, peg_indices_a, peg_indices_b, rank)
+
+    def _cycle_pegs(self, disk_count, source_peg, destination_peg, intermediate_peg):
+        # The smallest disk cycles through the returned pegs in order, which
+        # is what the move index arithmetic in `_iter_moves` relies on.
+        if disk_count % 2 == 0:
+            return (source_peg, destination_peg, intermediate_peg)
+        return (source_peg, intermediate_peg, destination_peg)
+
+    def _disk_sizes_at(self, disk_count, move_count):
+        # Returns the sizes of the disks on the source, destination, and
+        # intermediate pegs, ordered from bottom to top, after the specified
+        # count of moves.  The largest disk of a sub-tower of `m` disks is
+        # moved by move number `2 ** (m - 1)`, so comparing the remaining move
+        # count against that number places each disk and selects which half
+        # of the sub-tower's solution the smaller disks are in.
+        disk_sizes = ([], [], [])
+        source, destination, intermediate = 0, 1, 2
+        for disk_size in range(disk_count, 0, -1):
+            half_move_count = 1 << (disk_size - 1)
+            if move_count < half_move_count:
+                disk_sizes[source].append(disk_size)
+                destination, intermediate = intermediate, destination
+            else:
+                disk_sizes[destination].append(disk_size)
+                move_count -= half_move_count
+                source, intermediate = intermediate, source
+        return disk_sizes
+
+    def _frames_at(self, disk_count, source, destination, intermediate, move_index):
+        # Returns the stack of frames of `_move` and the sub-tower whose bottom
+        # disk is moved by the specified move.  Within a sub-tower of `m`
+        # disks, the bottom disk is moved by move index `2 ** (m - 1) - 1`;
+        # earlier moves belong to the sub-tower above it, which is moved out of
+        # the way while its frame waits on the stack, and later moves to the
+        # sub-tower moved back on top of it.
+        frames = []
+        while True:
+            half_move_count = 1 << (disk_count - 1)
+            if move_index == half_move_count - 1:
+                return (frames, disk_count, source, destination, intermediate)
+            if move_index < half_move_count:
+                frames.append((disk_count, source, destination, intermediate))
+                disk_count, destination, intermediate = disk_count - 1, intermediate, destination
+            else:
+                move_index -= half_move_count
+                disk_count, source, intermediate = disk_count - 1, intermediate, source
+
+    def _gather_decisions(self, peg_indices, disk_count, target):
+        # Returns the decisions of the shortest solution that gathers the
+        # specified count of smallest disks on the target peg, in the order
+        # they are executed, as `(rank, from, to, other)` tuples of peg
+        # indices.  `peg_indices` holds the index of the peg holding each disk
+        # in ascending order of size, and `rank` is the one-based position of
+        # a disk in that order.
+        #
+        # Scanning from the largest disk down, a disk that is not on its target
+        # peg must be moved there directly, which first requires all smaller
+        # disks to be gathered on the remaining peg; that peg becomes the target
+        # of the smaller disks.  A disk already on its target peg never moves.
+        decisions = []
+        for rank in range(disk_count, 0, -1):
+            peg_index = peg_indices[rank - 1]
+            if peg_index != target:
+                other = 3 - peg_index - target
+                decisions.append((rank, peg_index, target, other))
+                target = other
+        decisions.reverse()
+        return decisions
+
+    def _gather_move_count(self, peg_indices, disk_count, target):
+        # Returns the count of moves of the solution of `_gather_decisions`;
+        # each decision moves its disk and then a tower of all smaller disks.
+        move_count = 0
+        for rank in range(disk_count, 0, -1):
+            peg_index = peg_indices[rank - 1]
+            if peg_index != target:
+                move_count += 1 << (rank - 1)
+                target = 3 - peg_index - target
+        return move_count
+
+    def _iter_moves(self, pegs, start, stop):
+        # Inlines `_move_at` to avoid a method call per move.
+        for move_number in range(start + 1, stop + 1):
+            yield (
+                (move_number & -move_number).bit_length(),
+                pegs[(move_number & (move_number - 1)) % 3],
+                pegs[((move_number | (move_number - 1)) + 1) % 3]
+            )
+
+    def _iter_path(self, names, disk_sizes, peg_indices_a, peg_indices_b, rank):
+        if rank == 0:
+            return
+
+        disk_size = disk_sizes[rank - 1]
+        from_peg, to_peg = peg_indices_a[rank - 1], peg_indices_b[rank - 1]
+        other_peg = 3 - from_peg - to_peg
+        direct_move_count, indirect_move_count = self._path_move_counts(peg_indices_a, peg_indices_b, rank)
+        if direct_move_count <= indirect_move_count:
+            yield from self._iter_solve(names, disk_sizes, self._gather_decisions(peg_indices_a, rank - 1, other_peg))
+            yield (disk_size, names[from_peg], names[to_peg])
+            yield from self._iter_scatter(names, disk_sizes, self._gather_decisions(peg_indices_b, rank - 1, other_peg))
+        else:
+            yield from self._iter_solve(names, disk_sizes, self._gather_decisions(peg_indices_a, rank - 1, to_peg))
+            yield (disk_size, names[from_peg], names[other_peg])
+            yield from self._iter_tower(names, disk_sizes, rank - 1, to_peg, from_peg, other_peg)
+            yield (disk_size, names[other_peg], names[to_peg])
+            yield from self._iter_scatter(names, disk_sizes, self._gather_decisions(peg_indices_b, rank - 1, from_peg))
+
+    def _iter_scatter(self, pegs, disk_sizes, decisions):
+        # Yields the moves of `_iter_solve` in reverse, which spread a tower
+        # of disks into the configuration from which the decisions gather
+        # them.  The reverse of a tower solution is the tower solution in the
+        # opposite direction, since both are the unique shortest solution.
+        for rank, from_peg, to_peg, other_peg in reversed(decisions):
+            yield from self._iter_tower(pegs, disk_sizes, rank - 1, to_peg, other_peg, from_peg)
+            yield (disk_sizes[rank - 1], pegs[to_peg], pegs[from_peg])
+
+    def _iter_solve(self, pegs, disk_sizes, decisions):
+        # Each decision moves its disk straight to its target once the smaller
+        # disks have been gathered on the other peg, and then moves the smaller
+        # disks, which now form a tower, on top of it.
+        for rank, from_peg, to_peg, other_peg in decisions:
+            yield (disk_sizes[rank - 1], pegs[from_peg], pegs[to_peg])
+            yield from self._iter_tower(pegs, disk_sizes, rank - 1, other_peg, to_peg, from_peg)
+
+    def _iter_tower(self, pegs, disk_sizes, disk_count, source, destination, intermediate):
+        # Yields the moves of the smallest disks, which form a tower, from the
+        # source to the destination; the pegs are indices into `pegs`.
+        tower_pegs = self._cycle_pegs(disk_count, pegs[source], pegs[destination], pegs[intermediate])
+        for rank, from_peg, to_peg in self._iter_moves(tower_pegs, 0, (1 << disk_count) - 1):
+            yield (disk_sizes[rank - 1], from_peg, to_peg)
+
+    def _measure_move(self, move, disk_count, source_peg, destination_peg, intermediate_peg, callback, events, start):
+        # Counts the moves and times the callback from a wrapper around it so
+        # that the engine performing `move` is not instrumented.  The pushes,
+        # pops, and pegs are not counted at `Peg.push` and `Peg.pop` but are
+        # derived from the moves: each move pops and pushes a disk once, which
+        # creates two pegs.
+        move_count = 0
+        callback_seconds = 0.0
+        perf_counter = time.perf_counter
+
+        def measure_callback(pegs_or_move):
+            nonlocal callback_seconds, move_count
+            move_count += 1
+            if callback is not None:
+                callback_start_time = perf_counter()
+                callback(pegs_or_move)
+                callback_seconds += perf_counter() - callback_start_time
+
+        start_time = perf_counter()
+        try:
+            return move(disk_count, source_peg, destination_peg, intermediate_peg, measure_callback, events and (callback is not None), start)
+        finally:
+            self._metrics._record(
+                move_count=move_count,
+                push_count=move_count,
+                pop_count=move_count,
+                peg_count=2 * move_count,
+                callback_count=move_count if callback is not None else 0,
+                callback_seconds=callback_seconds,
+                engine_seconds=perf_counter() - start_time - callback_seconds
+            )
+
+    def _move(self, disk_count, source_peg, destination_peg, intermediate_peg, callback, events, start):
+        # The recursion is unrolled onto an explicit stack of frames so that
+        # the Python call stack depth stays constant regardless of the disk
+        # count.  Because pegs are immutable, the frames refer to pegs by their
+        # index in `pegs` rather than holding on to (soon to be stale) pegs.
+        # The frames are built for the first move to perform, so a solution
+        # may be resumed from any move.
+        pegs = [source_peg, destination_peg, intermediate_peg]
+        if start == (1 << disk_count) - 1:
+            return tuple(pegs)
+        frames, disk_count, source, destination, intermediate = self._frames_at(disk_count, 0, 1, 2, start)
+        move_index = start
+        while True:
+            while True:
+                pegs[source], disk = pegs[source].pop()
+                pegs[destination] = pegs[destination].push(disk)
+                if callback is not None:
+                    if events:
+                        callback(Move(move_index, disk, pegs[source].name(), pegs[destination].name()))
+                        move_index += 1
+                    else:
+                        callback([pegs[source], pegs[destination], pegs[intermediate]])
+                if disk_count > 1:
+                    disk_count, source, intermediate = disk_count - 1, intermediate, source
+                    break
+                if not frames:
+                    return tuple(pegs)
+                disk_count, source, destination, intermediate = frames.pop()
+            while disk_count > 1:
+                frames.append((disk_count, source, destination, intermediate))
+                disk_count, destination, intermediate = disk_count - 1, intermediate, destination
+
+    def _move_cached(self, disk_count, source_peg, destination_peg, intermediate_peg, callback, events, start):
+        # Performs the moves of the compact sequence produced by the cache,
+        # skipping the blocks before the first move to perform.
+        pegs = [source_peg, destination_peg, intermediate_peg]
+        moves = solution_cache.MOVES
+        move_index = start
+        skip_count = start
+        for block in self._cache.iter_blocks(disk_count):
+            if skip_count > 0:
+                if skip_count >= len(block):
+                    skip_count -= len(block)
+                    continue
+                block = block[skip_count:]
+                skip_count = 0
+            for code in block:
+                from_peg, to_peg, other_peg = moves[code]
+                pegs[from_peg], disk = pegs[from_peg].pop()
+                pegs[to_peg] = pegs[to_peg].push(disk)
+                if callback is not None:
+                    if events:
+                        callback(Move(move_index, disk, pegs[from_peg].name(), pegs[to_peg].name()))
+                        move_index += 1
+                    else:
+                        callback([pegs[from_peg], pegs[to_peg], pegs[other_peg]])
+        return tuple(pegs)
+
+    def _move_at(self, pegs, move_index):
+        # Move number `k` (one-based) moves the disk whose size is one more
+        # than the count of trailing zero bits in `k`, from peg
+        # `(k & (k - 1)) % 3` to peg `((k | (k - 1)) + 1) % 3`.
+        move_number = move_index + 1
+        return (
+            (move_number & -move_number).bit_length(),
+            pegs[(move_number & (move_number - 1)) % 3],
+            pegs[((move_number | (move_number - 1)) + 1) % 3]
+        )
+
+    def _path_move_counts(self, peg_indices_a, peg_indices_b, rank):
+        # Returns the counts of moves of the two candidate shortest paths
+        # between two states whose largest disk on different pegs has the
+        # specified rank.  On the direct path, that disk moves once, after the
+        # smaller disks are gathered on the remaining peg.  On the indirect
+        # path, it moves twice, through the remaining peg, while the smaller
+        # disks are gathered on its final peg and then moved as a tower to its
+        # initial peg.  Larger disks never move.
+        from_peg, to_peg = peg_indices_a[rank - 1], peg_indices_b[rank - 1]
+        other_peg = 3 - from_peg - to_peg
+        return (
+            self._gather_move_count(peg_indices_a, rank - 1, other_peg) + 1 + self._gather_move_count(peg_indices_b, rank - 1, other_peg),
+            self._gather_move_count(peg_indices_a, rank - 1, to_peg) + (1 << (rank - 1)) + 1 + self._gather_move_count(peg_indices_b, rank - 1, from_peg)
+        )
+
+    def _solve_decisions(self, pegs, target_peg):
+        # Returns the sizes of all disks in ascending order and the decisions
+        # of the shortest solution; see `_gather_decisions`.  Disks are ranked
+        # so that any distinct sizes may be used.
+        assert len(pegs) == 3
+
+        targets = [peg_index for peg_index, peg in enumerate(pegs) if peg is target_peg]
+        assert len(targets) == 1
+        target = targets[0]
+
+        peg_indices_by_disk_size = {}
+        for peg_index, peg in enumerate(pegs):
+            previous_disk = None
+            for disk in peg.view():
+                if ((previous_disk is not None) and not (disk < previous_disk)) or (disk.size() in peg_indices_by_disk_size):
+                    raise Exception('pegs must hold a legal configuration')
+                peg_indices_by_disk_size[disk.size()] = peg_index
+                previous_disk = disk
+
+        disk_sizes = sorted(peg_indices_by_disk_size)
+        peg_indices = [peg_indices_by_disk_size[disk_size] for disk_size in disk_sizes]
+        return (disk_sizes, self._gather_decisions(peg_indices, len(disk_sizes), target))
+
+    async def amoves(self, disk_count, source_peg, destination_peg, intermediate_peg, start=0, stop=None, batch_size=1024):
+        '''
+        Returns an asynchronous iterator over batches of the moves required to
+        move the specified count of disks from the source peg to the
+        destination peg.
+
+        The moves are those yielded by `iter_moves`.  Each batch is computed
+        only when the consumer asks for it, so a slow consumer is never sent
+        moves faster than it takes them, and control is returned to the event
+        loop before each batch after the first, so many games streaming moves
+        on one loop are interleaved.  Larger batches increase throughput at the
+        expense of the latency of other tasks on the loop.
+
+        :param disk_count: The count of disks to move; must be positive.
+        :type disk_count: int
+        :param source_peg: The peg containing the disks to move.
+        :param destination_peg: The peg to which the disks will be moved.
+        :param intermediate_peg: The peg to be used to facilitate the move
+            according to the game rules.
+        :param start: The index of the first move to yield.  Defaults to 0.
+        :type start: int
+        :param stop: The index *after* the last move to yield.  Defaults to
+            `None`, in which case all remaining moves are yielded.
+        :type stop: int
+        :param batch_size: The maximum count of moves in each batch; must be
+            positive.  Defaults to 1024.
+        :type batch_size: int
+
+        :returns: An asynchronous iterator of lists of `(disk_size, from_peg,
+            to_peg)` tuples.
+        '''
+
+        assert disk_count > 0
+        move_count = 2 ** disk_count - 1
+        if stop is None:
+            stop = move_count
+        assert 0 <= start <= stop <= move_count
+        assert batch_size > 0
+
+        pegs = self._cycle_pegs(disk_count, source_peg, destination_peg, intermediate_peg)
+        for batch_start in range(start, stop, batch_size):
+            if batch_start > start:
+                await asyncio.sleep(0)
+            yield list(self._iter_moves(pegs, batch_start, min(batch_start + batch_size, stop)))
+
     def create_peg(self, name, disk_count=0):
         ''''
         Returns a new peg with the specified name and containing the specified
@@ -144,13 +993,121 @@ class Game:
 
         assert disk_count >= 0
 
+        if self._metrics is not None:
+            self._metrics._record(peg_count=1)
         return Peg(name, [Disk(disk_size) for disk_size in range(disk_count, 0, -1)])
 
-    def move(self, disk_count, source_peg, destination_peg, intermediate_peg, callback=(lambda *args, **kwargs: None)):
+    def distance(self, bitboard_a, bitboard_b):
+        '''
+        Returns the count of moves of the shortest sequence of moves between
+        the specified states.
+
+        The count is computed in time proportional to the disk count from the
+        positions of the disks; no moves are performed or searched.
+
+        :param bitboard_a: The first state.
+        :type bitboard_a: Bitboard
+        :param bitboard_b: The second state.
+        :type bitboard_b: Bitboard
+
+        :returns: The count of moves between the states.
+
+        :raises: Exception - If the states do not have the same pegs or do not
+            hold the same disks.
+        '''
+
+        _, _, peg_indices_a, peg_indices_b, rank = self._compare_states(bitboard_a, bitboard_b)
+        if rank == 0:
+            return 0
+        return min(self._path_move_counts(peg_indices_a, peg_indices_b, rank))
+
+    def iter_moves(self, disk_count, source_peg, destination_peg, intermediate_peg, start=0, stop=None):
+        '''
+        Returns an iterator over the moves required to move the specified
+        count of disks from the source peg to the destination peg.
+
+        The moves are computed on demand from their index and are yielded in
+        the same order in which `move` performs them.  No pegs are created or
+        modified, so the pegs may be `Peg` instances or any other objects that
+        identify them, such as their names.
+
+        :param disk_count: The count of disks to move; must be positive.
+        :type disk_count: int
+        :param source_peg: The peg containing the disks to move.
+        :param destination_peg: The peg to which the disks will be moved.
+        :param intermediate_peg: The peg to be used to facilitate the move
+            according to the game rules.
+        :param start: The index of the first move to yield.  Defaults to 0.
+        :type start: int
+        :param stop: The index *after* the last move to yield.  Defaults to
+            `None`, in which case all remaining moves are yielded.
+        :type stop: int
+
+        :returns: An iterator of `(disk_size, from_peg, to_peg)` tuples.
+        '''
+
+        assert disk_count > 0
+        move_count = 2 ** disk_count - 1
+        if stop is None:
+            stop = move_count
+        assert 0 <= start <= stop <= move_count
+
+        return self._iter_moves(self._cycle_pegs(disk_count, source_peg, destination_peg, intermediate_peg), start, stop)
+
+    def iter_path(self, bitboard_a, bitboard_b):
+        '''
+        Returns an iterator over the moves of the shortest sequence of moves
+        from the first state to the second state.
+
+        The moves are computed on demand, and their count is that returned by
+        `distance`.
+
+        :param bitboard_a: The first state.
+        :type bitboard_a: Bitboard
+        :param bitboard_b: The second state.
+        :type bitboard_b: Bitboard
+
+        :returns: An iterator of `(disk_size, from_name, to_name)` tuples.
+
+        :raises: Exception - If the states do not have the same pegs or do not
+            hold the same disks.
+        '''
+
+        return self._iter_path(*self._compare_states(bitboard_a, bitboard_b))
+
+    def iter_solve(self, pegs, target_peg):
+        '''
+        Returns an iterator over the moves required to move all disks on the
+        specified pegs to the target peg.
+
+        The pegs may hold any legal configuration of disks, and the moves are
+        those of the shortest solution.  They are computed on demand from a
+        chain of at most one decision per disk; no pegs are created or
+        modified.
+
+        :param pegs: The sequence of the three pegs.
+        :param target_peg: The peg, which must be one of `pegs`, to which all
+            disks will be moved.
+        :type target_peg: Peg
+
+        :returns: An iterator of `(disk_size, from_peg, to_peg)` tuples.
+
+        :raises: Exception - If the pegs do not hold a legal configuration.
+        '''
+
+        disk_sizes, decisions = self._solve_decisions(pegs, target_peg)
+        return self._iter_solve(tuple(pegs), disk_sizes, decisions)
+
+    def move(self, disk_count, source_peg, destination_peg, intermediate_peg, callback=None, events=False, profiler=None, start=0):
         '''
         Moves the specified count of disks from the source peg to the
         destination peg.
 
+        The solution may be resumed from any move by specifying `start` and
+        pegs in the state after that count of moves, such as those returned by
+        `state_at`; the remaining moves and callbacks are the same as those of
+        the whole solution.
+
         :param disk_count: The count of disks to move; must be positive.
         :type disk_count: int
         :param source_peg: The peg containing the disks to move.
@@ -162,20 +1119,371 @@ class Game:
         :type intermediate_peg: Peg
         :param callback: The optional callback to be invoked *after* each disk
             is moved.  The callback will receive a sequence of all pegs in no
-            particular order.
+            particular order, or a `Move` describing the move if `events` is
+            `True`.  Defaults to `None`, in which case no callback is invoked.
+        :param events: Indicates the callback should receive a `Move` rather
+            than the pegs.  Defaults to `False`.
+        :type events: bool
+        :param profiler: The optional profiler, such as a `cProfile.Profile`,
+            enabled only for the duration of the move.  Defaults to `None`.
+        :param start: The index of the first move to perform; must not exceed
+            `2 ** disk_count - 1`.  Defaults to 0.
+        :type start: int
 
         :returns: A tuple containing the new source, destination, and
             intermediate pegs that reflect the result of the move.
         '''
 
         assert disk_count > 0
+        assert 0 <= start <= 2 ** disk_count - 1
+
+        move = self._move if self._cache is None else self._move_cached
+        if self._metrics is not None:
+            move = functools.partial(self._measure_move, move)
+        if profiler is None:
+            return move(disk_count, source_peg, destination_peg, intermediate_peg, callback, events, start)
+        return profiler.runcall(move, disk_count, source_peg, destination_peg, intermediate_peg, callback, events, start)
+
+    def move_bitboard(self, disk_count, bitboard, source_name, destination_name, intermediate_name, callback=None):
+        '''
+        Moves the specified count of disks from the source peg to the
+        destination peg of the specified state.
+
+        :param disk_count: The count of disks to move; must be positive.
+        :type disk_count: int
+        :param bitboard: The state containing the pegs.
+        :type bitboard: Bitboard
+        :param source_name: The name of the peg containing the disks to move.
+        :type source_name: str
+        :param destination_name: The name of the peg to which the disks will be
+            moved.
+        :type destination_name: str
+        :param intermediate_name: The name of the peg to be used to facilitate
+            the move according to the game rules.
+        :type intermediate_name: str
+        :param callback: The optional callback to be invoked *after* each disk
+            is moved.  The callback will receive the state after the move.
+            Defaults to `None`, in which case no callback is invoked and the
+            final state is computed without performing the individual moves.
+
+        :returns: The state reflecting the result of the move.
+
+        :raises: Exception - If the disks to move are not at the top of the
+            source peg.
+        '''
+
+        assert disk_count > 0
+
+        names = bitboard.names()
+        source = names.index(source_name)
+        destination = names.index(destination_name)
+        intermediate = names.index(intermediate_name)
+        masks = list(bitboard.masks())
+        disks_mask = (1 << disk_count) - 1
+        if (masks[source] & disks_mask) != disks_mask:
+            raise Exception('disks to move must be at the top of the source peg')
+
+        if callback is None:
+            masks[source] ^= disks_mask
+            masks[destination] |= disks_mask
+            return Bitboard._from_masks(names, tuple(masks))
+
+        # The bit of the disk moved by move number `k` is the lowest set bit
+        # of `k`; see `_move_at`.
+        pegs = self._cycle_pegs(disk_count, source, destination, intermediate)
+        for move_number in range(1, disks_mask + 1):
+            disk_bit = move_number & -move_number
+            masks[pegs[(move_number & (move_number - 1)) % 3]] ^= disk_bit
+            masks[pegs[((move_number | (move_number - 1)) + 1) % 3]] |= disk_bit
+            bitboard = Bitboard._from_masks(names, tuple(masks))
+            callback(bitboard)
+        return bitboard
 
-        if disk_count > 1:
-            source_peg, intermediate_peg, destination_peg = self.move(disk_count - 1, source_peg, intermediate_peg, destination_peg, callback)
-        source_peg, disk = source_peg.pop()
-        destination_peg = destination_peg.push(disk)
-        callback([source_peg, destination_peg, intermediate_peg])
-        if disk_count > 1:
-            intermediate_peg, destination_peg, source_peg = self.move(disk_count - 1, intermediate_peg, destination_peg, source_peg, callback)
+    def move_at(self, disk_count, move_index, source_peg, destination_peg, intermediate_peg):
+        '''
+        Returns the move at the specified index of the solution that moves the
+        specified count of disks from the source peg to the destination peg.
+
+        The move is computed directly from its index in constant time; no
+        preceding moves are performed.  As with `iter_moves`, the pegs may be
+        any objects that identify them.
+
+        :param disk_count: The count of disks to move; must be positive.
+        :type disk_count: int
+        :param move_index: The zero-based index of the move; must be less than
+            `2 ** disk_count - 1`.
+        :type move_index: int
+        :param source_peg: The peg containing the disks to move.
+        :param destination_peg: The peg to which the disks will be moved.
+        :param intermediate_peg: The peg to be used to facilitate the move
+            according to the game rules.
+
+        :returns: A `(disk_size, from_peg, to_peg)` tuple.
+        '''
+
+        assert disk_count > 0
+        assert 0 <= move_index < 2 ** disk_count - 1
+
+        return self._move_at(self._cycle_pegs(disk_count, source_peg, destination_peg, intermediate_peg), move_index)
+
+    def moves_at(self, disk_count, move_indices, source_peg, destination_peg, intermediate_peg):
+        '''
+        Returns the moves at the specified indices of the solution that moves
+        the specified count of disks from the source peg to the destination
+        peg.
+
+        This is the vectorized form of `move_at`.  The moves are computed with
+        array operations if NumPy is installed.
+
+        :param disk_count: The count of disks to move; must be positive.
+        :type disk_count: int
+        :param move_indices: The iterable or NumPy array of zero-based move
+            indices; each must be less than `2 ** disk_count - 1`.
+        :param source_peg: The peg containing the disks to move.
+        :param destination_peg: The peg to which the disks will be moved.
+        :param intermediate_peg: The peg to be used to facilitate the move
+            according to the game rules.
+
+        :returns: A list of `(disk_size, from_peg, to_peg)` tuples in the same
+            order as `move_indices`.
+        '''
+
+        assert disk_count > 0
+
+        # The indices are read more than once, so any iterator is consumed
+        # into a list first; NumPy arrays are used as they are.
+        if not hasattr(move_indices, 'tolist'):
+            move_indices = list(move_indices)
+
+        if vectorized.is_available() and (disk_count <= vectorized.MAX_DISK_COUNT):
+            pegs = (source_peg, destination_peg, intermediate_peg)
+            disk_sizes, from_indices, to_indices = vectorized.move_arrays(disk_count, move_indices)
+            return [
+                (disk_size, pegs[from_index], pegs[to_index])
+                for disk_size, from_index, to_index in zip(disk_sizes.tolist(), from_indices.tolist(), to_indices.tolist())
+            ]
+
+        move_count = 2 ** disk_count - 1
+        assert all(0 <= move_index < move_count for move_index in move_indices)
+
+        pegs = self._cycle_pegs(disk_count, source_peg, destination_peg, intermediate_peg)
+        return [self._move_at(pegs, move_index) for move_index in move_indices]
+
+    def solve(self, pegs, target_peg, callback=None, events=False):
+        '''
+        Moves all disks on the specified pegs to the target peg.
+
+        The pegs may hold any legal configuration of disks, and the disks are
+        moved using the shortest solution; see `iter_solve`.
+
+        :param pegs: The sequence of the three pegs.
+        :param target_peg: The peg, which must be one of `pegs`, to which all
+            disks will be moved.
+        :type target_peg: Peg
+        :param callback: The optional callback to be invoked *after* each disk
+            is moved.  The callback will receive a sequence of all pegs in no
+            particular order, or a `Move` describing the move if `events` is
+            `True`.  Defaults to `None`, in which case no callback is invoked.
+        :param events: Indicates the callback should receive a `Move` rather
+            than the pegs.  Defaults to `False`.
+        :type events: bool
+
+        :returns: A tuple containing the new pegs, in the same order as `pegs`,
+            that reflect the result of the move.
+
+        :raises: Exception - If the pegs do not hold a legal configuration.
+        '''
+
+        disk_sizes, decisions = self._solve_decisions(pegs, target_peg)
+        pegs = list(pegs)
+        for move_index, (_, from_peg, to_peg) in enumerate(self._iter_solve((0, 1, 2), disk_sizes, decisions)):
+            pegs[from_peg], disk = pegs[from_peg].pop()
+            pegs[to_peg] = pegs[to_peg].push(disk)
+            if callback is not None:
+                if events:
+                    callback(Move(move_index, disk, pegs[from_peg].name(), pegs[to_peg].name()))
+                else:
+                    callback(list(pegs))
+        return tuple(pegs)
+
+    def state_at(self, disk_count, move_count, source_name, destination_name, intermediate_name):
+        '''
+        Returns new pegs reflecting the state of the game after the specified
+        count of moves of the solution that moves the specified count of disks
+        from the source peg to the destination peg.
+
+        The state is computed directly in time proportional to the disk count;
+        no moves are performed.
+
+        :param disk_count: The count of disks to move; must be positive.
+        :type disk_count: int
+        :param move_count: The count of moves performed; must not exceed
+            `2 ** disk_count - 1`.
+        :type move_count: int
+        :param source_name: The name of the peg initially containing the
+            disks.
+        :type source_name: str
+        :param destination_name: The name of the peg to which the disks will be
+            moved.
+        :type destination_name: str
+        :param intermediate_name: The name of the peg to be used to facilitate
+            the move according to the game rules.
+        :type intermediate_name: str
+
+        :returns: A tuple containing the source, destination, and intermediate
+            pegs.
+        '''
+
+        assert disk_count > 0
+        assert 0 <= move_count <= 2 ** disk_count - 1
+
+        return tuple(
+            Peg(name, [Disk(disk_size) for disk_size in disk_sizes])
+            for name, disk_sizes in zip((source_name, destination_name, intermediate_name), self._disk_sizes_at(disk_count, move_count))
+        )
+
+class MultiPegGame:
+    '''
+    Facade for the Tower of Hanoi game with three or more pegs.
+
+    Disks are moved using the Frame-Stewart algorithm: the smallest disks are
+    moved to an intermediate peg using all pegs, the remaining disks are moved
+    to the destination peg without using that peg, and the smallest disks are
+    moved on top of them.  The count of smallest disks that minimizes the count
+    of moves is looked up in a table that is shared by all instances and
+    extended as larger games are played.
+    '''
+
+    # The tables are indexed by peg count and then by disk count.
+    _move_counts = {}
+    _splits = {}
+
+    def __init__(self):
+        '''
+        Initializes a new instance of the `MultiPegGame` class.
+        '''
+
+        self._game = Game()
+
+    @classmethod
+    def _extend_tables(cls, disk_count, peg_count):
+        # Fills the tables in order of increasing peg count so that each
+        # entry only depends on complete entries.  The move count for three
+        # pegs is known in closed form and is not tabulated.
+        for table_peg_count in range(4, peg_count + 1):
+            move_counts = cls._move_counts.setdefault(table_peg_count, [0, 1])
+            splits = cls._splits.setdefault(table_peg_count, [0, 0])
+            for table_disk_count in range(len(move_counts), disk_count + 1):
+                move_count, split = min(
+                    (2 * move_counts[split] + cls._move_count(table_disk_count - split, table_peg_count - 1), split)
+                    for split in range(1, table_disk_count)
+                )
+                move_counts.append(move_count)
+                splits.append(split)
+
+    def _iter_moves(self, disk_count, pegs):
+        # The recursion is unrolled onto an explicit stack of sub-games, each
+        # moving the disks above `disk_offset` from the first peg to the
+        # second peg using the remaining pegs, so that only the sub-games not
+        # yet played are held in memory.  A sub-game with three pegs, or a
+        # single disk, is played using the three-peg solution.
+        game = self._game
+        sub_games = [(disk_count, 0, pegs)]
+        while sub_games:
+            disk_count, disk_offset, pegs = sub_games.pop()
+            if disk_count == 0:
+                continue
+            if (len(pegs) == 3) or (disk_count == 1):
+                tower_pegs = game._cycle_pegs(disk_count, pegs[0], pegs[1], pegs[2])
+                for disk_size, from_peg, to_peg in game._iter_moves(tower_pegs, 0, (1 << disk_count) - 1):
+                    yield (disk_size + disk_offset, from_peg, to_peg)
+                continue
+
+            split = self._splits[len(pegs)][disk_count]
+            source_peg, destination_peg, intermediate_peg = pegs[:3]
+            other_pegs = pegs[3:]
+            sub_games.append((split, disk_offset, (intermediate_peg, destination_peg, source_peg) + other_pegs))
+            sub_games.append((disk_count - split, disk_offset + split, (source_peg, destination_peg) + other_pegs))
+            sub_games.append((split, disk_offset, (source_peg, intermediate_peg, destination_peg) + other_pegs))
+
+    @classmethod
+    def _move_count(cls, disk_count, peg_count):
+        if peg_count == 3:
+            return (1 << disk_count) - 1
+        return cls._move_counts[peg_count][disk_count]
+
+    def iter_moves(self, disk_count, pegs):
+        '''
+        Returns an iterator over the moves required to move the specified
+        count of disks from the first peg to the second peg.
+
+        The moves are computed on demand, and no pegs are created or modified,
+        so the pegs may be `Peg` instances or any other objects that identify
+        them, such as their names.
+
+        :param disk_count: The count of disks to move; must be positive.
+        :type disk_count: int
+        :param pegs: The sequence of at least three pegs, starting with the
+            peg containing the disks to move and the peg to which the disks
+            will be moved.
+
+        :returns: An iterator of `(disk_size, from_peg, to_peg)` tuples.
+        '''
+
+        assert disk_count > 0
+        assert len(pegs) >= 3
+
+        self._extend_tables(disk_count, len(pegs))
+        return self._iter_moves(disk_count, tuple(pegs))
+
+    def move(self, disk_count, pegs, callback=None, events=False):
+        '''
+        Moves the specified count of disks from the first peg to the second
+        peg.
+
+        :param disk_count: The count of disks to move; must be positive.
+        :type disk_count: int
+        :param pegs: The sequence of at least three pegs, starting with the
+            peg containing the disks to move and the peg to which the disks
+            will be moved.
+        :param callback: The optional callback to be invoked *after* each disk
+            is moved.  The callback will receive a sequence of all pegs in no
+            particular order, or a `Move` describing the move if `events` is
+            `True`.  Defaults to `None`, in which case no callback is invoked.
+        :param events: Indicates the callback should receive a `Move` rather
+            than the pegs.  Defaults to `False`.
+        :type events: bool
+
+        :returns: A tuple containing the new pegs, in the same order as `pegs`,
+            that reflect the result of the move.
+        '''
+
+        pegs = list(pegs)
+        for move_index, (_, from_peg, to_peg) in enumerate(self.iter_moves(disk_count, range(len(pegs)))):
+            pegs[from_peg], disk = pegs[from_peg].pop()
+            pegs[to_peg] = pegs[to_peg].push(disk)
+            if callback is not None:
+                if events:
+                    callback(Move(move_index, disk, pegs[from_peg].name(), pegs[to_peg].name()))
+                else:
+                    callback(list(pegs))
+        return tuple(pegs)
+
+    def move_count(self, disk_count, peg_count):
+        '''
+        Returns the count of moves required to move the specified count of
+        disks between two of the specified count of pegs.
+
+        :param disk_count: The count of disks to move; must not be negative.
+        :type disk_count: int
+        :param peg_count: The count of pegs; must be at least three.
+        :type peg_count: int
+
+        :returns: The count of moves.
+        '''
+
+        assert disk_count >= 0
+        assert peg_count >= 3
 
-        return (source_peg, destination_peg, intermediate_peg)
\ No newline at end of file
+        self._extend_tables(disk_count, peg_count)
+        return self._move_count(disk_count, peg_count)
@@ -0,0 +1,212 @@
+import vectorized
+from tower_of_hanoi import Bitboard, Game
+
+class ValidationResult:
+    '''
+    The result of validating a sequence of moves.
+    '''
+
+    def __init__(self, move_count, error_index=None, error=None):
+        '''
+        Initializes a new instance of the `ValidationResult` class.
+
+        :param move_count: The count of legal moves performed.
+        :type move_count: int
+        :param error_index: The index of the first illegal move.  Defaults to
+            `None`, in which case all moves are legal.
+        :type error_index: int
+        :param error: The description of the reason the moves are not valid.
+            Defaults to `None`, in which case the moves are valid.
+        :type error: str
+        '''
+
+        self._error = error
+        self._error_index = error_index
+        self._move_count = move_count
+
+    def __repr__(self):
+        return 'ValidationResult(move_count={move_count}, error_index={error_index}, error={error})'.format(
+            move_count=self._move_count,
+            error_index=self._error_index,
+            error=self._error
+        )
+
+    def error(self):
+        '''
+        Returns the description of the reason the moves are not valid.
+
+        :returns: The description of the reason the moves are not valid, or
+            `None` if the moves are valid.
+        '''
+
+        return self._error
+
+    def error_index(self):
+        '''
+        Returns the index of the first illegal move.
+
+        :returns: The index of the first illegal move, or `None` if all moves
+            are legal.
+        '''
+
+        return self._error_index
+
+    def is_valid(self):
+        '''
+        Indicates all moves are legal and reach the goal.
+
+        :returns: `True` if all moves are legal and reach the goal; otherwise
+            `False`.
+        '''
+
+        return self._error is None
+
+    def move_count(self):
+        '''
+        Returns the count of legal moves performed.
+
+        :returns: The count of legal moves performed before the first illegal
+            move, if any.
+        '''
+
+        return self._move_count
+
+def _goal_masks(names, goal):
+    if goal is None:
+        return None
+    masks_by_name = dict(zip(goal.names(), goal.masks()))
+    if sorted(masks_by_name) != sorted(names):
+        raise Exception('goal must have the same pegs')
+    return [masks_by_name[name] for name in names]
+
+def _validate(masks, peg_indices, moves, start_index, goal_masks):
+    # Performs the moves on the disk masks of the pegs, indexed by
+    # `peg_indices[from_name]` and `peg_indices[to_name]`, until the first
+    # illegal move.  The disk of each move is the lowest set bit of the mask
+    # of its from peg.
+    move_count = start_index
+    for move_count, (disk_size, from_name, to_name) in enumerate(moves, start_index + 1):
+        try:
+            from_peg = peg_indices[from_name]
+            to_peg = peg_indices[to_name]
+        except (KeyError, TypeError):
+            return ValidationResult(move_count - 1, move_count - 1, 'peg does not exist')
+        from_mask = masks[from_peg]
+        to_mask = masks[to_peg]
+        disk_bit = from_mask & -from_mask
+        if (to_mask & ((disk_bit << 1) - 1)) or (disk_bit.bit_length() != disk_size) or (from_peg == to_peg):
+            if from_mask == 0:
+                error = 'peg is empty'
+            elif disk_bit.bit_length() != disk_size:
+                error = 'disk is not at the top of the peg'
+            elif from_peg == to_peg:
+                error = 'disk must be moved to another peg'
+            else:
+                error = 'disk must be smaller than top disk'
+            return ValidationResult(move_count - 1, move_count - 1, error)
+        masks[from_peg] = from_mask ^ disk_bit
+        masks[to_peg] = to_mask | disk_bit
+
+    if (goal_masks is not None) and (masks != goal_masks):
+        return ValidationResult(move_count, None, 'moves do not reach the goal')
+    return ValidationResult(move_count)
+
+def validate(bitboard, moves, goal=None):
+    '''
+    Validates the specified moves by performing them from the specified state.
+
+    Each move is checked for legality using the disk masks of the state, so
+    no pegs are created and no exceptions are raised for illegal moves.
+
+    :param bitboard: The state from which the moves are performed.
+    :type bitboard: Bitboard
+    :param moves: The iterable of `(disk_size, from_name, to_name)` tuples, as
+        yielded by `Game.iter_moves` or `MoveLogReader`.
+    :param goal: The state the moves must reach.  Defaults to `None`, in which
+        case the moves may reach any state.
+    :type goal: Bitboard
+
+    :returns: The result of the validation.
+    :rtype: ValidationResult
+
+    :raises: Exception - If the goal does not have the same pegs as the state.
+    '''
+
+    names = bitboard.names()
+    peg_indices = {name: peg_index for peg_index, name in enumerate(names)}
+    return _validate(list(bitboard.masks()), peg_indices, moves, 0, _goal_masks(names, goal))
+
+def validate_arrays(bitboard, disk_sizes, from_indices, to_indices, goal=None, block_size=1 << 20):
+    '''
+    Validates the specified moves, given as arrays, by performing them from
+    the specified state.
+
+    The pegs of the moves are identified by their index in the names of the
+    state.  If NumPy is installed and the state and goal hold a tower on
+    different pegs, blocks of moves are compared with the solution computed
+    by `Game` using array operations; moves are only performed one at a time
+    from the first move that differs.
+
+    :param bitboard: The state from which the moves are performed.
+    :type bitboard: Bitboard
+    :param disk_sizes: The array or sequence of the disk size of each move.
+    :param from_indices: The array or sequence of the index of the peg from
+        which each disk is moved.
+    :param to_indices: The array or sequence of the index of the peg to which
+        each disk is moved.
+    :param goal: The state the moves must reach.  Defaults to `None`, in which
+        case the moves may reach any state.
+    :type goal: Bitboard
+    :param block_size: The count of moves compared at a time; must be
+        positive.  Defaults to 1048576.
+    :type block_size: int
+
+    :returns: The result of the validation.
+    :rtype: ValidationResult
+
+    :raises: Exception - If the goal does not have the same pegs as the state.
+    '''
+
+    assert len(disk_sizes) == len(from_indices) == len(to_indices)
+    assert block_size > 0
+
+    names = bitboard.names()
+    masks = list(bitboard.masks())
+    goal_masks = _goal_masks(names, goal)
+    move_count = len(disk_sizes)
+    start_index = 0
+
+    disks_mask = masks[0] | masks[1] | masks[2]
+    disk_count = disks_mask.bit_length()
+    if (
+        vectorized.is_available() and (goal_masks is not None) and (0 < disk_count <= vectorized.MAX_DISK_COUNT)
+        and (disks_mask == (1 << disk_count) - 1) and (disks_mask in masks) and (disks_mask in goal_masks)
+        and (masks.index(disks_mask) != goal_masks.index(disks_mask))
+    ):
+        numpy = vectorized.numpy
+        source, destination = masks.index(disks_mask), goal_masks.index(disks_mask)
+        peg_indices = numpy.array((source, destination, 3 - source - destination), dtype=numpy.int8)
+        solution_move_count = (1 << disk_count) - 1
+        for block_start, solution_disk_sizes, solution_from_indices, solution_to_indices in vectorized.iter_move_arrays(disk_count, 0, min(move_count, solution_move_count), block_size):
+            block_stop = block_start + len(solution_disk_sizes)
+            matches = (
+                (numpy.asarray(disk_sizes[block_start:block_stop]) == solution_disk_sizes)
+                & (numpy.asarray(from_indices[block_start:block_stop]) == peg_indices[solution_from_indices])
+                & (numpy.asarray(to_indices[block_start:block_stop]) == peg_indices[solution_to_indices])
+            )
+            if not matches.all():
+                start_index = block_start + int(matches.argmin())
+                break
+            start_index = block_stop
+
+        if start_index > 0:
+            role_names = tuple(names[peg_index] for peg_index in peg_indices.tolist())
+            state = Bitboard.from_pegs(Game().state_at(disk_count, start_index, *role_names))
+            masks_by_name = dict(zip(state.names(), state.masks()))
+            masks = [masks_by_name[name] for name in names]
+
+    # NumPy arrays are converted to lists, whose items are much faster to
+    # operate on one at a time.
+    remaining_arrays = [array[start_index:] for array in (disk_sizes, from_indices, to_indices)]
+    remaining_arrays = [array.tolist() if hasattr(array, 'tolist') else array for array in remaining_arrays]
+    return _validate(masks, {0: 0, 1: 1, 2: 2}, zip(*remaining_arrays), start_index, goal_masks)
@@ -0,0 +1,216 @@
+import array
+
+from tower_of_hanoi import Move
+
+class History:
+    '''
+    A history of the moves performed on the pegs of a Tower of Hanoi game
+    that supports undoing and redoing them.
+
+    Each move is recorded as a single byte, `3 * from_peg + to_peg`, where the
+    pegs are identified by their index in the pegs of the history; the disk
+    of a move is the top disk of the peg from which it is moved.  The state of
+    the pegs is also recorded every `snapshot_interval` moves, so the pegs may
+    be rewound or fast-forwarded to any recorded index by restoring the
+    nearest state and performing fewer than `snapshot_interval` moves.  Once
+    more than `max_length` moves are recorded, the oldest ones are dropped and
+    can no longer be undone.
+    '''
+
+    def __init__(self, pegs, max_length=None, snapshot_interval=4096):
+        '''
+        Initializes a new instance of the `History` class.
+
+        :param pegs: The sequence of the three pegs whose moves are recorded.
+            Undoing and redoing moves modifies the pegs.
+        :param max_length: The maximum count of moves retained.  Must be
+            positive.  Defaults to `None`, in which case all moves are
+            retained.
+        :type max_length: int
+        :param snapshot_interval: The count of moves between recorded states;
+            must be positive.  Defaults to 4096.
+        :type snapshot_interval: int
+        '''
+
+        assert len(pegs) == 3
+        assert (max_length is None) or (max_length > 0)
+        assert snapshot_interval > 0
+
+        self._codes = array.array('B')
+        self._index = 0
+        self._max_length = max_length
+        self._peg_indices = {peg.name(): peg_index for peg_index, peg in enumerate(pegs)}
+        self._pegs = tuple(pegs)
+        self._snapshot_interval = snapshot_interval
+        self._snapshots = [self._snapshot()]
+        self._start_index = 0
+        self._start_snapshot_number = 0
+
+    def _drop_oldest_moves(self):
+        # Drops a quarter of the retained moves at once, so the cost of
+        # shifting the remaining moves is amortized over many records.
+        drop_count = len(self._codes) - self._max_length + self._max_length // 4
+        del self._codes[:drop_count]
+        self._start_index += drop_count
+        start_snapshot_number = -(-self._start_index // self._snapshot_interval)
+        del self._snapshots[:start_snapshot_number - self._start_snapshot_number]
+        self._start_snapshot_number = start_snapshot_number
+
+    def _restore(self, snapshot_number):
+        # Moves all disks to the pegs recorded by the snapshot.  The pegs are
+        # modified rather than replaced, and keep the same disks.
+        disks_by_size = {}
+        for peg in self._pegs:
+            while not peg.is_empty():
+                disk = peg.pop()
+                disks_by_size[disk.size()] = disk
+        for peg, mask in zip(self._pegs, self._snapshots[snapshot_number - self._start_snapshot_number]):
+            for disk_size in sorted(disks_by_size, reverse=True):
+                if mask & (1 << (disk_size - 1)):
+                    peg.push(disks_by_size[disk_size])
+        self._index = snapshot_number * self._snapshot_interval
+
+    def _snapshot(self):
+        return tuple(sum(1 << (disk.size() - 1) for disk in peg.view()) for peg in self._pegs)
+
+    def can_redo(self):
+        '''
+        Indicates a move may be redone.
+
+        :returns: `True` if a move may be redone; otherwise `False`.
+        '''
+
+        return self._index < self.stop_index()
+
+    def can_undo(self):
+        '''
+        Indicates a move may be undone.
+
+        :returns: `True` if a move may be undone; otherwise `False`.
+        '''
+
+        return self._index > self._start_index
+
+    def index(self):
+        '''
+        Returns the count of moves performed to reach the current state of the
+        pegs.
+
+        :returns: The index of the move that would be redone or recorded next.
+        '''
+
+        return self._index
+
+    def record(self, move):
+        '''
+        Records the specified move, which has been performed on the pegs.
+
+        Any undone moves are discarded.  This method may be passed as the
+        callback of `Game.move` when `events` is `True`.
+
+        :param move: The move to record.
+        :type move: Move
+        '''
+
+        codes = self._codes
+        position = self._index - self._start_index
+        if position < len(codes):
+            del codes[position:]
+            del self._snapshots[self._index // self._snapshot_interval - self._start_snapshot_number + 1:]
+        codes.append(3 * self._peg_indices[move.from_name()] + self._peg_indices[move.to_name()])
+        self._index += 1
+        if self._index % self._snapshot_interval == 0:
+            self._snapshots.append(self._snapshot())
+        if (self._max_length is not None) and (len(codes) > self._max_length):
+            self._drop_oldest_moves()
+
+    def redo(self):
+        '''
+        Performs the move following the current state of the pegs again.
+
+        :returns: The move performed.
+        :rtype: Move
+
+        :raises: Exception - If no move may be redone.
+        '''
+
+        if not self.can_redo():
+            raise Exception('no move to redo')
+
+        from_index, to_index = divmod(self._codes[self._index - self._start_index], 3)
+        from_peg, to_peg = self._pegs[from_index], self._pegs[to_index]
+        disk = from_peg.pop()
+        to_peg.push(disk)
+        self._index += 1
+        return Move(self._index - 1, disk, from_peg.name(), to_peg.name())
+
+    def seek(self, index):
+        '''
+        Undoes or redoes moves until the specified count of moves has been
+        performed.
+
+        The nearest recorded state is restored if that requires fewer moves,
+        so seeking takes time proportional to the disk count plus at most the
+        snapshot interval.
+
+        :param index: The count of moves to have performed; must be between
+            `start_index` and `stop_index`, inclusive.
+        :type index: int
+        '''
+
+        assert self._start_index <= index <= self.stop_index()
+
+        # The candidate snapshots are those at or before and after the index;
+        # restoring one is assumed to cost as much as one interval of moves.
+        interval = self._snapshot_interval
+        for snapshot_number in (index // interval, -(-index // interval)):
+            snapshot_index = snapshot_number * interval
+            if (
+                (self._start_snapshot_number <= snapshot_number < self._start_snapshot_number + len(self._snapshots))
+                and (abs(index - snapshot_index) + interval < abs(index - self._index))
+            ):
+                self._restore(snapshot_number)
+        while self._index < index:
+            self.redo()
+        while self._index > index:
+            self.undo()
+
+    def start_index(self):
+        '''
+        Returns the index of the oldest retained move.
+
+        :returns: The smallest count of moves to which the pegs may be
+            rewound.
+        '''
+
+        return self._start_index
+
+    def stop_index(self):
+        '''
+        Returns the index *after* the newest recorded move.
+
+        :returns: The largest count of moves to which the pegs may be
+            fast-forwarded.
+        '''
+
+        return self._start_index + len(self._codes)
+
+    def undo(self):
+        '''
+        Reverses the move preceding the current state of the pegs.
+
+        :returns: The move reversed, as it was originally performed.
+        :rtype: Move
+
+        :raises: Exception - If no move may be undone.
+        '''
+
+        if not self.can_undo():
+            raise Exception('no move to undo')
+
+        self._index -= 1
+        from_index, to_index = divmod(self._codes[self._index - self._start_index], 3)
+        from_peg, to_peg = self._pegs[from_index], self._pegs[to_index]
+        disk = to_peg.pop()
+        from_peg.push(disk)
+        return Move(self._index, disk, from_peg.name(), to_peg.name())
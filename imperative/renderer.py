@@ -0,0 +1,242 @@
+import abc
+import json
+import operator
+
+class Renderer(abc.ABC):
+    '''
+    Base class for renderers that stream the solution of a Tower of Hanoi game
+    to a text stream.
+
+    Rendered text is accumulated into a buffer that is written to the stream
+    with a single call once it is full, so the stream is never written to or
+    flushed per line.  Subclasses implement `_iter_text`.
+    '''
+
+    def __init__(self, stream, every=1, buffer_size=1 << 20):
+        '''
+        Initializes a new instance of the `Renderer` class.
+
+        :param stream: The text stream to which the solution is written.
+        :param every: The sampling interval; only every `every`-th move is
+            rendered.  Must be positive.  Defaults to 1.
+        :type every: int
+        :param buffer_size: The count of characters accumulated before they
+            are written to the stream; must be positive.  Defaults to 1 MiB.
+        :type buffer_size: int
+        '''
+
+        assert every > 0
+        assert buffer_size > 0
+
+        self._buffer_size = buffer_size
+        self._every = every
+        self._stream = stream
+
+    def _iter_moves(self, game, disk_count, source_name, destination_name, intermediate_name, start, stop):
+        # Yields the `(move_index, disk_size, from_name, to_name)` tuples of
+        # the sampled moves in the range.  Unsampled moves are skipped rather
+        # than generated.
+        if self._every == 1:
+            return (
+                (move_index, disk_size, from_name, to_name)
+                for move_index, (disk_size, from_name, to_name) in enumerate(game.iter_moves(disk_count, source_name, destination_name, intermediate_name, start, stop), start)
+            )
+        return (
+            (move_index,) + game.move_at(disk_count, move_index, source_name, destination_name, intermediate_name)
+            for move_index in range(start + (self._every - 1 - start) % self._every, stop, self._every)
+        )
+
+    @abc.abstractmethod
+    def _iter_text(self, game, disk_count, source_name, destination_name, intermediate_name, start, stop):
+        # Yields the rendered text of the sampled moves in the range, in
+        # pieces of any length.
+        pass
+
+    def render(self, game, disk_count, source_name, destination_name, intermediate_name, start=0, stop=None):
+        '''
+        Renders the solution that moves the specified count of disks from the
+        source peg to the destination peg.
+
+        A range of the solution may be rendered by itself; rendering adjacent
+        ranges one after the other produces the same text as rendering the
+        whole solution at once.
+
+        :param game: The game used to compute the solution.
+        :type game: Game
+        :param disk_count: The count of disks to move; must be positive.
+        :type disk_count: int
+        :param source_name: The name of the peg initially containing the
+            disks.
+        :type source_name: str
+        :param destination_name: The name of the peg to which the disks will be
+            moved.
+        :type destination_name: str
+        :param intermediate_name: The name of the peg to be used to facilitate
+            the move according to the game rules.
+        :type intermediate_name: str
+        :param start: The index of the first move to render.  Defaults to 0.
+        :type start: int
+        :param stop: The index *after* the last move to render.  Defaults to
+            `None`, in which case all remaining moves are rendered.
+        :type stop: int
+        '''
+
+        assert disk_count > 0
+        move_count = 2 ** disk_count - 1
+        if stop is None:
+            stop = move_count
+        assert 0 <= start <= stop <= move_count
+
+        write = self._stream.write
+        buffer = []
+        buffered_size = 0
+        for text in self._iter_text(game, disk_count, source_name, destination_name, intermediate_name, start, stop):
+            buffer.append(text)
+            buffered_size += len(text)
+            if buffered_size >= self._buffer_size:
+                write(''.join(buffer))
+                buffer.clear()
+                buffered_size = 0
+        if buffer:
+            write(''.join(buffer))
+
+class MoveRenderer(Renderer):
+    '''
+    Base class for renderers that render each sampled move on its own line.
+
+    Each line is a fixed prefix, the move index, and a suffix describing the
+    rest of the move.  Subclasses implement `_format_line_suffix`.
+    '''
+
+    # Moves are rendered in aligned blocks of `2 ** _BLOCK_DISK_COUNT` moves
+    # when every move is sampled.
+    _BLOCK_DISK_COUNT = 10
+
+    _line_prefix = ''
+
+    def _format_line(self, move_index, disk_size, from_name, to_name):
+        return self._line_prefix + str(move_index) + self._format_line_suffix(disk_size, from_name, to_name)
+
+    @abc.abstractmethod
+    def _format_line_suffix(self, disk_size, from_name, to_name):
+        # Returns the text following the move index of a line, including the
+        # line break.
+        pass
+
+    def _iter_text(self, game, disk_count, source_name, destination_name, intermediate_name, start, stop):
+        if self._every != 1:
+            for move in self._iter_moves(game, disk_count, source_name, destination_name, intermediate_name, start, stop):
+                yield self._format_line(*move)
+            return
+
+        # Within a block of moves starting at a multiple of the block size,
+        # each move's disk depends only on its offset in the block and its
+        # pegs depend only on the offset and the block start modulo 3 (see
+        # `Game._move_at`).  So only three distinct blocks of line suffixes
+        # exist, and each block's lines are built by joining the suffixes with
+        # the move indices without a Python-level loop per move.  The move at
+        # the end of each block moves a larger disk, and moves outside whole
+        # blocks at either end of the range are rendered one at a time.
+        block_size = 2 ** self._BLOCK_DISK_COUNT
+        block_line_suffixes = {}
+        move_index = start
+        while move_index < stop:
+            if (move_index % block_size != 0) or (move_index + block_size - 1 > stop):
+                yield self._format_line(move_index, *game.move_at(disk_count, move_index, source_name, destination_name, intermediate_name))
+                move_index += 1
+                continue
+
+            line_suffixes = block_line_suffixes.get(move_index % 3)
+            if line_suffixes is None:
+                line_suffixes = [
+                    self._format_line_suffix(*move)
+                    for move in game.iter_moves(disk_count, source_name, destination_name, intermediate_name, move_index, move_index + block_size - 1)
+                ]
+                block_line_suffixes[move_index % 3] = line_suffixes
+            move_indices = map(str, range(move_index, move_index + block_size - 1))
+            if self._line_prefix:
+                move_indices = map(self._line_prefix.__add__, move_indices)
+            yield ''.join(map(operator.add, move_indices, line_suffixes))
+            move_index += block_size - 1
+
+class TextRenderer(Renderer):
+    '''
+    Renders the initial state and the state of all pegs, ordered by name,
+    after each sampled move.
+    '''
+
+    def _disk_sizes_at(self, game, disk_count, move_count, source_name, destination_name, intermediate_name):
+        pegs = game.state_at(disk_count, move_count, source_name, destination_name, intermediate_name)
+        return {peg.name(): [disk.size() for disk in peg.view()] for peg in pegs}
+
+    def _format_peg_lines(self, name, disk_sizes):
+        # Returns the rendered lines of the peg holding each count of its
+        # bottom disks, from none up to all of them.
+        lines = ['{0}: \n'.format(name)]
+        for disk_size in disk_sizes:
+            lines.append(self._push_line(lines[-1], disk_size))
+        return lines
+
+    def _format_state(self, names, disk_sizes_by_name):
+        return '==========\n' + ''.join(
+            '{0}: {1}\n'.format(name, ' - '.join([str(disk_size) for disk_size in disk_sizes_by_name[name]]))
+            for name in names
+        )
+
+    def _iter_text(self, game, disk_count, source_name, destination_name, intermediate_name, start, stop):
+        names = sorted([source_name, destination_name, intermediate_name])
+        if start == 0:
+            disk_sizes_by_name = {source_name: list(range(disk_count, 0, -1)), destination_name: [], intermediate_name: []}
+            yield self._format_state(names, disk_sizes_by_name)
+        else:
+            disk_sizes_by_name = self._disk_sizes_at(game, disk_count, start, source_name, destination_name, intermediate_name)
+
+        if self._every == 1:
+            # Track the rendered line of each peg incrementally rather than
+            # rebuilding the state.  Each peg keeps a stack of its lines, so a
+            # move pops a line off one peg and pushes a line extended by the
+            # moved disk onto the other, and the unchanged peg is not rendered
+            # at all.
+            lines_by_name = {name: self._format_peg_lines(name, disk_sizes_by_name[name]) for name in names}
+            first_lines, second_lines, third_lines = [lines_by_name[name] for name in names]
+            push_line = self._push_line
+            for _, disk_size, from_name, to_name in self._iter_moves(game, disk_count, source_name, destination_name, intermediate_name, start, stop):
+                lines_by_name[from_name].pop()
+                to_lines = lines_by_name[to_name]
+                to_lines.append(push_line(to_lines[-1], disk_size))
+                yield '==========\n' + first_lines[-1] + second_lines[-1] + third_lines[-1]
+        else:
+            for move_index, _, _, _ in self._iter_moves(game, disk_count, source_name, destination_name, intermediate_name, start, stop):
+                yield self._format_state(names, self._disk_sizes_at(game, disk_count, move_index + 1, source_name, destination_name, intermediate_name))
+
+    def _push_line(self, line, disk_size):
+        # Returns the rendered line of a peg after the disk is pushed onto the
+        # peg rendered as the specified line.
+        if line.endswith(': \n'):
+            return line[:-1] + str(disk_size) + '\n'
+        return line[:-1] + ' - ' + str(disk_size) + '\n'
+
+class CompactRenderer(MoveRenderer):
+    '''
+    Renders each sampled move on one line as its index, the disk size, and the
+    names of the pegs from and to which the disk was moved.
+    '''
+
+    def _format_line_suffix(self, disk_size, from_name, to_name):
+        return ' %d %s %s\n' % (disk_size, from_name, to_name)
+
+class JsonLinesRenderer(MoveRenderer):
+    '''
+    Renders each sampled move as a JSON object on its own line.
+    '''
+
+    _line_prefix = '{"index": '
+
+    def _format_line_suffix(self, disk_size, from_name, to_name):
+        return ', "disk": %d, "from": %s, "to": %s}\n' % (disk_size, json.dumps(from_name), json.dumps(to_name))
+
+RENDERERS = {
+    'compact': CompactRenderer,
+    'jsonl': JsonLinesRenderer,
+    'text': TextRenderer
+}
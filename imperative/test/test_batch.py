@@ -0,0 +1,81 @@
+import concurrent.futures
+import unittest
+import unittest.mock as mock
+
+import batch
+from batch import solve_batch
+from tower_of_hanoi import Game
+
+class SolveBatchTestCase(unittest.TestCase):
+    _SPECS = [(5, 'a', 'c', 'b'), (1, 'x', 'y', 'z'), (9, 'c', 'a', 'b'), (5, 'b', 'a', 'c')]
+
+    def test__solve_batch__returns_results_in_order_of_specs(self):
+        results = solve_batch(self._SPECS, max_workers=1)
+
+        self.assertEqual([spec[0] for spec in self._SPECS], [result.disk_count() for result in results])
+        self.assertEqual([spec[1:] for spec in self._SPECS], [result.names() for result in results])
+        self.assertEqual([31, 1, 511, 31], [result.move_count() for result in results])
+
+    def test__solve_batch__when_keep_moves_is_true__returns_same_moves_as_iter_moves(self):
+        results = solve_batch(self._SPECS, max_workers=1, keep_moves=True, block_disk_count=3)
+
+        for spec, result in zip(self._SPECS, results):
+            with self.subTest(spec=spec):
+                self.assertEqual(list(Game().iter_moves(*spec)), list(result.iter_moves()))
+
+    def test__solve_batch__when_keep_moves_is_false__does_not_return_moves(self):
+        result, = solve_batch([(3, 'a', 'c', 'b')], max_workers=1)
+
+        with self.assertRaises(Exception):
+            result.iter_moves()
+
+    def test__solve_batch__when_instances_have_same_disk_count__returns_same_digest(self):
+        results = solve_batch(self._SPECS, max_workers=1)
+
+        self.assertEqual(results[0].digest(), results[3].digest())
+        self.assertNotEqual(results[0].digest(), results[2].digest())
+
+    def test__solve_batch__when_instances_have_same_disk_count__solves_disk_count_once(self):
+        with mock.patch('batch._solve_segment', wraps=batch._solve_segment) as solve_segment_spy:
+            solve_batch(self._SPECS * 3, max_workers=1)
+
+        self.assertEqual([9, 5, 1], [solve_segment_call[0][1] for solve_segment_call in solve_segment_spy.call_args_list])
+
+    def test__solve_batch__when_move_count_exceeds_segment_size__solves_segments_separately(self):
+        spec = (9, 'c', 'a', 'b')
+
+        with mock.patch.object(batch, '_SEGMENT_SIZE', 100), mock.patch('batch._solve_segment', wraps=batch._solve_segment) as solve_segment_spy:
+            result, = solve_batch([spec], max_workers=1, keep_moves=True, block_disk_count=3)
+
+        self.assertEqual(
+            [(9, 0, 100), (9, 100, 200), (9, 200, 300), (9, 300, 400), (9, 400, 500), (9, 500, 511)],
+            [solve_segment_call[0][1:4] for solve_segment_call in solve_segment_spy.call_args_list]
+        )
+        self.assertEqual(list(Game().iter_moves(*spec)), list(result.iter_moves()))
+
+    def test__solve_batch__when_max_workers_is_2__returns_same_results_as_single_process(self):
+        specs = self._SPECS * 10
+
+        results = solve_batch(specs, max_workers=2, keep_moves=True)
+
+        expected_results = solve_batch(specs, max_workers=1, keep_moves=True)
+        self.assertEqual(
+            [(result.names(), result.digest(), list(result.iter_moves())) for result in expected_results],
+            [(result.names(), result.digest(), list(result.iter_moves())) for result in results]
+        )
+
+    def test__solve_batch__when_max_workers_is_2__splits_large_disk_count_across_workers(self):
+        spec = (9, 'c', 'a', 'b')
+        submit = concurrent.futures.ProcessPoolExecutor.submit
+
+        with mock.patch.object(batch, '_SEGMENT_SIZE', 100):
+            with mock.patch.object(concurrent.futures.ProcessPoolExecutor, 'submit', autospec=True, side_effect=submit) as submit_spy:
+                result, = solve_batch([spec], max_workers=2, keep_moves=True, block_disk_count=3)
+            expected_result, = solve_batch([spec], max_workers=1, keep_moves=True, block_disk_count=3)
+
+        self.assertEqual(6, submit_spy.call_count)
+        self.assertEqual(expected_result.digest(), result.digest())
+        self.assertEqual(list(Game().iter_moves(*spec)), list(result.iter_moves()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from history import History
+from tower_of_hanoi import Game, Move
+
+class HistoryTestCase(unittest.TestCase):
+    def _assert_state(self, move_count):
+        expected_pegs = self._game.state_at(self._disk_count, move_count, 'a', 'c', 'b')
+        self.assertEqual(list(expected_pegs), self._pegs)
+
+    def _solve(self, history):
+        self._game.move(self._disk_count, *self._pegs, callback=history.record, events=True)
+
+    def setUp(self):
+        self._disk_count = 5
+        self._game = Game()
+        self._pegs = [self._game.create_peg('a', self._disk_count), self._game.create_peg('c'), self._game.create_peg('b')]
+
+    def test__undo__restores_state_before_move(self):
+        history = History(self._pegs)
+        self._solve(history)
+
+        for move_count in range(30, -1, -1):
+            history.undo()
+
+            self._assert_state(move_count)
+        self.assertFalse(history.can_undo())
+
+    def test__undo__returns_move_reversed(self):
+        history = History(self._pegs)
+        self._solve(history)
+
+        move = history.undo()
+
+        self.assertEqual(Move(30, self._game.create_peg('a', 1).pop(), 'a', 'c'), move)
+
+    def test__undo__when_no_move_recorded__raises_exception(self):
+        with self.assertRaises(Exception):
+            History(self._pegs).undo()
+
+    def test__redo__restores_state_after_move(self):
+        history = History(self._pegs)
+        self._solve(history)
+        history.seek(0)
+
+        for move_count in range(1, 32):
+            history.redo()
+
+            self._assert_state(move_count)
+        self.assertFalse(history.can_redo())
+
+    def test__redo__when_no_move_undone__raises_exception(self):
+        history = History(self._pegs)
+        self._solve(history)
+
+        with self.assertRaises(Exception):
+            history.redo()
+
+    def test__record__when_moves_undone__discards_undone_moves(self):
+        history = History(self._pegs, snapshot_interval=4)
+        self._solve(history)
+        history.seek(9)
+
+        disk = self._pegs[2].pop()
+        self._pegs[0].push(disk)
+        history.record(Move(9, disk, 'b', 'a'))
+
+        self.assertEqual(10, history.stop_index())
+        self.assertFalse(history.can_redo())
+        history.seek(8)
+        self._assert_state(8)
+
+    def test__seek__restores_state_after_count_of_moves(self):
+        history = History(self._pegs, snapshot_interval=4)
+        self._solve(history)
+
+        for move_count in [0, 17, 5, 6, 31, 13, 12, 30, 1]:
+            with self.subTest(move_count=move_count):
+                history.seek(move_count)
+
+                self.assertEqual(move_count, history.index())
+                self._assert_state(move_count)
+
+    def test__seek__when_max_length_exceeded__rewinds_to_oldest_retained_move(self):
+        history = History(self._pegs, max_length=8, snapshot_interval=4)
+        self._solve(history)
+
+        history.seek(history.start_index())
+
+        self.assertGreaterEqual(history.start_index(), 31 - 8)
+        self.assertFalse(history.can_undo())
+        self._assert_state(history.start_index())
+
+if __name__ == '__main__':
+    unittest.main()
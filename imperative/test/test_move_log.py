@@ -0,0 +1,108 @@
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock as mock
+
+from move_log import MoveLogReader, MoveLogWriter
+from tower_of_hanoi import Game
+
+class MoveLogTestCase(unittest.TestCase):
+    def _write_move_log(self, disk_count):
+        game = Game()
+        with MoveLogWriter(self._path, disk_count, ['a', 'b', 'c']) as writer:
+            game.move(disk_count, game.create_peg('a', disk_count), game.create_peg('c'), game.create_peg('b'), writer.record, events=True)
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, 'moves.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test__reader__returns_header_written_by_writer(self):
+        self._write_move_log(3)
+
+        with MoveLogReader(self._path) as reader:
+            self.assertEqual(3, reader.disk_count())
+            self.assertEqual(('a', 'b', 'c'), reader.names())
+            self.assertEqual(7, len(reader))
+
+    def test__reader__when_iterated__returns_same_moves_as_move(self):
+        disk_count = 7
+        self._write_move_log(disk_count)
+
+        with MoveLogReader(self._path) as reader:
+            self.assertEqual(list(Game().iter_moves(disk_count, 'a', 'c', 'b')), list(reader))
+
+    def test__reader__when_indexed__returns_same_moves_as_move(self):
+        disk_count = 7
+        self._write_move_log(disk_count)
+
+        with MoveLogReader(self._path) as reader:
+            for move_index, move in enumerate(Game().iter_moves(disk_count, 'a', 'c', 'b')):
+                self.assertEqual(move, reader[move_index])
+            self.assertEqual(reader[len(reader) - 1], reader[-1])
+
+    def test__reader__when_index_out_of_range__raises_index_error(self):
+        self._write_move_log(2)
+
+        with MoveLogReader(self._path) as reader:
+            with self.assertRaises(IndexError):
+                reader[3]
+
+    def test__reader__when_file_is_not_move_log__raises_exception(self):
+        with open(self._path, 'wb') as file:
+            file.write(b'not a move log')
+
+        with self.assertRaises(Exception):
+            MoveLogReader(self._path)
+
+    def test__reader__when_file_is_empty__raises_exception(self):
+        open(self._path, 'wb').close()
+
+        with self.assertRaisesRegex(Exception, 'file is not a move log'):
+            MoveLogReader(self._path)
+
+    def test__reader__when_magic_is_wrong__raises_exception_and_closes_file(self):
+        self._write_move_log(3)
+        with open(self._path, 'r+b') as file:
+            file.write(b'XXXX')
+
+        original_mmap = mmap.mmap
+        mmaps = []
+        def map_file(*args, **kwargs):
+            mmaps.append(original_mmap(*args, **kwargs))
+            return mmaps[-1]
+        with mock.patch.object(mmap, 'mmap', map_file):
+            with self.assertRaisesRegex(Exception, 'file is not a move log'):
+                MoveLogReader(self._path)
+
+        self.assertEqual(1, len(mmaps))
+        self.assertTrue(mmaps[0].closed)
+
+    def test__reader__when_names_are_truncated__raises_exception(self):
+        self._write_move_log(3)
+        os.truncate(self._path, 14 + 2 + 1 + 2)
+
+        with self.assertRaisesRegex(Exception, 'move log is truncated'):
+            MoveLogReader(self._path)
+
+    def test__reader__when_moves_are_truncated__raises_exception(self):
+        disk_count = 10
+        self._write_move_log(disk_count)
+        os.truncate(self._path, os.path.getsize(self._path) - 1)
+
+        with self.assertRaisesRegex(Exception, 'move log is truncated'):
+            MoveLogReader(self._path)
+
+    def test__writer__packs_each_move_into_3_bits(self):
+        disk_count = 10
+        self._write_move_log(disk_count)
+
+        header_size = 14 + 3 * (2 + 1)
+        self.assertEqual(header_size + (3 * (2 ** disk_count - 1) + 7) // 8, os.path.getsize(self._path))
+
+if __name__ == '__main__':
+    unittest.main()
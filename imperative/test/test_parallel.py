@@ -0,0 +1,38 @@
+import io
+import unittest
+
+from parallel import render_parallel
+from renderer import CompactRenderer, TextRenderer
+from tower_of_hanoi import Game
+
+class RenderParallelTestCase(unittest.TestCase):
+    def _render(self, renderer_class, disk_count, every=1):
+        stream = io.StringIO()
+        renderer_class(stream, every).render(Game(), disk_count, 'a', 'c', 'b')
+        return stream.getvalue()
+
+    def _render_parallel(self, renderer_class, disk_count, every=1):
+        stream = io.StringIO()
+        render_parallel(renderer_class, stream, disk_count, 'a', 'c', 'b', every, max_workers=2, chunk_size=100)
+        return stream.getvalue()
+
+    def test__render_parallel__writes_same_text_as_render(self):
+        self.assertEqual(self._render(CompactRenderer, 12), self._render_parallel(CompactRenderer, 12))
+
+    def test__render_parallel__when_every_is_7__writes_same_text_as_render(self):
+        self.assertEqual(self._render(CompactRenderer, 12, 7), self._render_parallel(CompactRenderer, 12, 7))
+
+    def test__render_parallel__when_renderer_tracks_state__writes_same_text_as_render(self):
+        self.assertEqual(self._render(TextRenderer, 9), self._render_parallel(TextRenderer, 9))
+
+    def test__render_parallel__when_start_and_stop_specified__writes_same_text_as_render(self):
+        stream = io.StringIO()
+        CompactRenderer(stream).render(Game(), 12, 'a', 'c', 'b', 1000, 3000)
+        parallel_stream = io.StringIO()
+
+        render_parallel(CompactRenderer, parallel_stream, 12, 'a', 'c', 'b', max_workers=2, chunk_size=300, start=1000, stop=3000)
+
+        self.assertEqual(stream.getvalue(), parallel_stream.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from solution_cache import MOVES, SolutionCache
+from tower_of_hanoi import Game
+
+class SolutionCacheTestCase(unittest.TestCase):
+    def _decode(self, sequence):
+        return [MOVES[code][:2] for code in sequence]
+
+    def _expected_moves(self, disk_count, source, destination):
+        return [(from_peg, to_peg) for _, from_peg, to_peg in Game().iter_moves(disk_count, source, destination, 3 - source - destination)]
+
+    def test__iter_blocks__when_disk_count_exceeds_block_disk_count__yields_blocks_of_same_moves_as_move(self):
+        cache = SolutionCache(block_disk_count=3)
+
+        blocks = list(cache.iter_blocks(7))
+
+        self.assertEqual(self._expected_moves(7, 0, 1), self._decode(b''.join(blocks)))
+        self.assertLessEqual(max(len(block) for block in blocks), 7)
+
+    def test__iter_blocks__when_disk_count_within_block_disk_count__yields_single_block(self):
+        cache = SolutionCache(block_disk_count=3)
+
+        self.assertEqual([cache.moves(3, 0, 1)], list(cache.iter_blocks(3)))
+
+    def test__iter_blocks__when_range_specified__yields_blocks_of_moves_in_range(self):
+        cache = SolutionCache(block_disk_count=3)
+
+        for disk_count, start, stop in [(7, 0, 127), (7, 5, 6), (7, 7, 8), (7, 16, 31), (7, 30, 100), (7, 64, 64), (3, 2, 5)]:
+            with self.subTest(disk_count=disk_count, start=start, stop=stop):
+                blocks = list(cache.iter_blocks(disk_count, start, stop))
+
+                self.assertEqual(self._expected_moves(disk_count, 0, 1)[start:stop], self._decode(b''.join(blocks)))
+                self.assertTrue(all(blocks))
+
+    def test__moves__returns_same_moves_as_move(self):
+        cache = SolutionCache()
+
+        for disk_count in range(1, 8):
+            for source, destination in [(0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1)]:
+                self.assertEqual(self._expected_moves(disk_count, source, destination), self._decode(cache.moves(disk_count, source, destination)))
+
+    def test__moves__when_sequence_cached__returns_cached_sequence(self):
+        cache = SolutionCache()
+        sequence = cache.moves(5, 2, 0)
+        miss_count = cache.miss_count()
+
+        self.assertIs(sequence, cache.moves(5, 2, 0))
+        self.assertEqual(miss_count, cache.miss_count())
+        self.assertEqual(1, cache.hit_count())
+
+    def test__moves__when_max_size_exceeded__evicts_least_recently_used_sequences(self):
+        cache = SolutionCache(max_size=15)
+        cache.moves(4, 0, 1)
+        cache.moves(4, 0, 2)
+        miss_count = cache.miss_count()
+
+        cache.moves(4, 0, 2)
+        self.assertEqual(miss_count, cache.miss_count())
+        cache.moves(4, 0, 1)
+        self.assertGreater(cache.miss_count(), miss_count)
+        self.assertLessEqual(cache.size(), 15)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,16 @@
+import asyncio
+import collections
+import cProfile
+import inspect
+import itertools
+import pstats
+import sys
 import unittest
 import unittest.mock as mock
 
-from tower_of_hanoi import Disk, Game, Peg
+import vectorized
+from solution_cache import SolutionCache
+from tower_of_hanoi import Bitboard, Disk, Game, Metrics, Move, MultiPegGame, Peg
 
 class DiskTestCase(unittest.TestCase):
     def test____eq____when_self_equals_other__returns_true(self):
@@ -10,6 +19,22 @@ class DiskTestCase(unittest.TestCase):
     def test____eq____when_self_size_not_equals_other__returns_false(self):
         self.assertNotEqual(Disk(1), Disk(2))
 
+    def test____new____when_size_equals_other__returns_same_instance(self):
+        self.assertIs(Disk(1), Disk(1))
+
+    def test____new____when_copied__returns_same_instance(self):
+        import copy
+        import pickle
+
+        disk = Disk(1)
+
+        self.assertIs(disk, copy.copy(disk))
+        self.assertIs(disk, copy.deepcopy(disk))
+        self.assertIs(disk, pickle.loads(pickle.dumps(disk)))
+
+    def test____hash____when_self_equals_other__returns_same_hash(self):
+        self.assertEqual(hash(Disk(1)), hash(Disk(1)))
+
     def test____lt____when_self_equals_other__returns_false(self):
         self.assertFalse(Disk(1) < Disk(1))
 
@@ -100,6 +125,140 @@ class PegTestCase(unittest.TestCase):
         with self.assertRaises(Exception):
             peg.push(self._disk_2)
 
+    def test__view__returns_disks_in_order_from_bottom_to_top(self):
+        peg = self._create_peg(disks=[self._disk_3, self._disk_2, self._disk_1])
+
+        view = peg.view()
+
+        self.assertEqual([self._disk_3, self._disk_2, self._disk_1], list(view))
+        self.assertEqual(3, len(view))
+        self.assertEqual(self._disk_3, view[0])
+        self.assertEqual(self._disk_1, view[-1])
+        self.assertEqual([self._disk_2, self._disk_1], view[1:])
+        self.assertEqual(self._disk_1, view.top())
+
+    def test__view__when_empty__top_raises_exception(self):
+        view = self._create_peg().view()
+
+        self.assertEqual(0, len(view))
+        with self.assertRaises(Exception):
+            view.top()
+
+    def test__view__when_index_out_of_range__raises_index_error(self):
+        view = self._create_peg(disks=[self._disk_1]).view()
+
+        with self.assertRaises(IndexError):
+            view[1]
+
+    def test__view__cannot_modify_peg(self):
+        peg = self._create_peg(disks=[self._disk_2])
+        view = peg.view()
+
+        with self.assertRaises(TypeError):
+            view[0] = self._disk_1
+        with self.assertRaises(AttributeError):
+            view.append(self._disk_1)
+        self.assertEqual([self._disk_2], peg.disks())
+
+    def test__view__reflects_changes_to_peg(self):
+        peg = self._create_peg(disks=[self._disk_2])
+        view = peg.view()
+
+        peg.push(self._disk_1)
+
+        self.assertEqual([self._disk_2, self._disk_1], list(view))
+
+class BitboardTestCase(unittest.TestCase):
+    def setUp(self):
+        self._names = ('a', 'b', 'c')
+
+    def test____eq____when_self_equals_other__returns_true(self):
+        self.assertEqual(Bitboard(self._names, [0b1, 0b10, 0]), Bitboard(self._names, [0b1, 0b10, 0]))
+
+    def test____eq____when_self_masks_not_equals_other__returns_false(self):
+        self.assertNotEqual(Bitboard(self._names, [0b1, 0b10, 0]), Bitboard(self._names, [0b10, 0b1, 0]))
+
+    def test____eq____when_self_names_not_equals_other__returns_false(self):
+        self.assertNotEqual(Bitboard(self._names, [0b1, 0b10, 0]), Bitboard(('a', 'b', 'd'), [0b1, 0b10, 0]))
+
+    def test____hash____when_self_equals_other__returns_same_hash(self):
+        self.assertEqual(hash(Bitboard(self._names, [0b1, 0b10, 0])), hash(Bitboard(self._names, [0b1, 0b10, 0])))
+
+    def test__from_pegs__returns_equivalent_state(self):
+        pegs = [Peg('a', [Disk(3)]), Peg('b', [Disk(2), Disk(1)]), Peg('c')]
+
+        bitboard = Bitboard.from_pegs(pegs)
+
+        self.assertEqual(Bitboard(self._names, [0b100, 0b11, 0]), bitboard)
+
+    def test__move__when_from_peg_empty__raises_exception(self):
+        bitboard = Bitboard(self._names, [0b1, 0, 0])
+
+        with self.assertRaises(Exception):
+            bitboard.move('b', 'a')
+
+    def test__move__when_to_peg_empty__moves_top_disk(self):
+        bitboard = Bitboard(self._names, [0b11, 0, 0])
+
+        self.assertEqual(Bitboard(self._names, [0b10, 0b1, 0]), bitboard.move('a', 'b'))
+
+    def test__move__when_disk_smaller_than_top_disk__moves_top_disk(self):
+        bitboard = Bitboard(self._names, [0b1, 0b10, 0])
+
+        self.assertEqual(Bitboard(self._names, [0, 0b11, 0]), bitboard.move('a', 'b'))
+
+    def test__move__when_disk_larger_than_top_disk__raises_exception(self):
+        bitboard = Bitboard(self._names, [0b10, 0b1, 0])
+
+        with self.assertRaises(Exception):
+            bitboard.move('a', 'b')
+
+    def test__move__does_not_modify_state(self):
+        bitboard = Bitboard(self._names, [0b11, 0, 0])
+
+        bitboard.move('a', 'b')
+
+        self.assertEqual(Bitboard(self._names, [0b11, 0, 0]), bitboard)
+
+    def test__to_pegs__returns_equivalent_pegs(self):
+        bitboard = Bitboard(self._names, [0b100, 0b11, 0])
+
+        pegs = bitboard.to_pegs()
+
+        self.assertEqual((Peg('a', [Disk(3)]), Peg('b', [Disk(2), Disk(1)]), Peg('c')), pegs)
+
+class MoveTestCase(unittest.TestCase):
+    def test____eq____when_self_equals_other__returns_true(self):
+        self.assertEqual(Move(0, Disk(1), 'a', 'b'), Move(0, Disk(1), 'a', 'b'))
+
+    def test____eq____when_self_index_not_equals_other__returns_false(self):
+        self.assertNotEqual(Move(0, Disk(1), 'a', 'b'), Move(1, Disk(1), 'a', 'b'))
+
+    def test____eq____when_self_disk_not_equals_other__returns_false(self):
+        self.assertNotEqual(Move(0, Disk(1), 'a', 'b'), Move(0, Disk(2), 'a', 'b'))
+
+    def test____eq____when_self_from_name_not_equals_other__returns_false(self):
+        self.assertNotEqual(Move(0, Disk(1), 'a', 'b'), Move(0, Disk(1), 'c', 'b'))
+
+    def test____eq____when_self_to_name_not_equals_other__returns_false(self):
+        self.assertNotEqual(Move(0, Disk(1), 'a', 'b'), Move(0, Disk(1), 'a', 'c'))
+
+class MetricsTestCase(unittest.TestCase):
+    def test__reset__sets_counters_to_zero(self):
+        metrics = Metrics()
+        game = Game(metrics)
+        game.move(2, game.create_peg('a', 2), game.create_peg('c'), game.create_peg('b'), lambda pegs: None)
+
+        metrics.reset()
+
+        self.assertEqual(0, metrics.callback_count())
+        self.assertEqual(0.0, metrics.callback_seconds())
+        self.assertEqual(0.0, metrics.engine_seconds())
+        self.assertEqual(0, metrics.move_count())
+        self.assertEqual(0, metrics.peg_count())
+        self.assertEqual(0, metrics.pop_count())
+        self.assertEqual(0, metrics.push_count())
+
 class GameTestCase(unittest.TestCase):
     class _MoveSpy(mock.Mock):
         '''
@@ -108,14 +267,15 @@ class GameTestCase(unittest.TestCase):
 
         Because `Peg`s are mutable, we must copy the peg arguments during each
         call instead of storing them directly.  Otherwise, all calls will
-        reflect the final state of the pegs.
+        reflect the final state of the pegs.  Tests that only need the moves
+        themselves can pass `events=True` to `Game.move` and use a plain mock.
         '''
 
-        def _mock_call(self, *args, **kwargs):
+        def __call__(self, *args, **kwargs):
             import copy
             args_copy = copy.deepcopy(args)
             kwargs_copy = copy.deepcopy(kwargs)
-            return super()._mock_call(*args_copy, **kwargs_copy)
+            return super().__call__(*args_copy, **kwargs_copy)
 
     def _create_peg_a(self, disks):
         return Peg('a', disks)
@@ -126,6 +286,38 @@ class GameTestCase(unittest.TestCase):
     def _create_peg_c(self, disks=[]):
         return Peg('c', disks)
 
+    def _create_pegs(self, peg_indices):
+        # Returns pegs a, b, and c holding the disks whose sizes are one more
+        # than the indices of `peg_indices` on the pegs at the indexed values.
+        disk_count = len(peg_indices)
+        return [
+            Peg(name, [Disk(disk_size) for disk_size in range(disk_count, 0, -1) if peg_indices[disk_size - 1] == peg_index])
+            for peg_index, name in enumerate('abc')
+        ]
+
+    def _create_bitboard(self, peg_indices):
+        return Bitboard(('a', 'b', 'c'), [sum(1 << disk_index for disk_index, disk_peg_index in enumerate(peg_indices) if disk_peg_index == peg_index) for peg_index in range(3)])
+
+    def _shortest_move_counts(self, start):
+        # Returns the count of moves of the shortest sequence between the
+        # start configuration and every other configuration by a breadth-first
+        # search.  Configurations are tuples of the peg index of each disk in
+        # ascending order of size.
+        move_counts = {start: 0}
+        queue = collections.deque([start])
+        while queue:
+            peg_indices = queue.popleft()
+            for disk_index, from_peg in enumerate(peg_indices):
+                if from_peg in peg_indices[:disk_index]:
+                    continue
+                for to_peg in range(3):
+                    if (to_peg != from_peg) and (to_peg not in peg_indices[:disk_index]):
+                        next_peg_indices = peg_indices[:disk_index] + (to_peg,) + peg_indices[disk_index + 1:]
+                        if next_peg_indices not in move_counts:
+                            move_counts[next_peg_indices] = move_counts[peg_indices] + 1
+                            queue.append(next_peg_indices)
+        return move_counts
+
     def setUp(self):
         self._disk_1 = Disk(1)
         self._disk_2 = Disk(2)
@@ -135,6 +327,35 @@ class GameTestCase(unittest.TestCase):
         self._peg_c = self._create_peg_c()
         self._game = Game()
 
+    def test__amoves__yields_same_moves_as_iter_moves_in_batches(self):
+        async def collect():
+            return [batch async for batch in self._game.amoves(7, 'a', 'c', 'b', batch_size=10)]
+
+        batches = asyncio.run(collect())
+
+        self.assertEqual([10] * 12 + [7], [len(batch) for batch in batches])
+        self.assertEqual(list(self._game.iter_moves(7, 'a', 'c', 'b')), [move for batch in batches for move in batch])
+
+    def test__amoves__when_start_and_stop_specified__yields_moves_in_range(self):
+        async def collect():
+            return [move async for batch in self._game.amoves(5, 'a', 'c', 'b', 3, 20, batch_size=4) for move in batch]
+
+        self.assertEqual(list(self._game.iter_moves(5, 'a', 'c', 'b', 3, 20)), asyncio.run(collect()))
+
+    def test__amoves__when_games_share_loop__interleaves_batches(self):
+        consumed_names = []
+
+        async def consume(name):
+            async for _ in Game().amoves(6, 'a', 'c', 'b', batch_size=16):
+                consumed_names.append(name)
+
+        async def consume_all():
+            await asyncio.gather(consume('x'), consume('y'))
+
+        asyncio.run(consume_all())
+
+        self.assertEqual(['x', 'y'] * 4, consumed_names)
+
     def test__create_peg__returns_peg_with_specified_name(self):
         name = 'name'
 
@@ -157,6 +378,139 @@ class GameTestCase(unittest.TestCase):
 
         self.assertEqual([self._disk_3, self._disk_2, self._disk_1], peg.disks())
 
+    def test__create_peg__when_metrics_specified__records_pushes_and_pegs(self):
+        metrics = Metrics()
+
+        Game(metrics).create_peg('name', 3)
+
+        self.assertEqual(3, metrics.push_count())
+        self.assertEqual(1, metrics.peg_count())
+
+    def test__distance__when_states_equal__returns_0(self):
+        bitboard = self._create_bitboard((0, 1, 2))
+
+        self.assertEqual(0, self._game.distance(bitboard, bitboard))
+
+    def test__distance__when_tower_moved__returns_move_count_of_move(self):
+        disk_count = 40
+
+        distance = self._game.distance(self._create_bitboard((0,) * disk_count), self._create_bitboard((2,) * disk_count))
+
+        self.assertEqual(2 ** disk_count - 1, distance)
+
+    def test__distance__returns_count_of_moves_of_shortest_path_between_every_pair_of_states(self):
+        for start, move_counts in ((start, self._shortest_move_counts(start)) for start in itertools.product(range(3), repeat=3)):
+            for end, move_count in move_counts.items():
+                self.assertEqual(move_count, self._game.distance(self._create_bitboard(start), self._create_bitboard(end)))
+
+    def test__distance__when_pegs_named_in_different_order__returns_distance(self):
+        bitboard_a = Bitboard(('a', 'b', 'c'), [0b11, 0, 0])
+        bitboard_b = Bitboard(('c', 'a', 'b'), [0b11, 0, 0])
+
+        self.assertEqual(3, self._game.distance(bitboard_a, bitboard_b))
+
+    def test__distance__when_states_hold_different_disks__raises_exception(self):
+        with self.assertRaises(Exception):
+            self._game.distance(self._create_bitboard((0, 0)), self._create_bitboard((0, 0, 0)))
+
+    def test__distance__when_states_have_different_pegs__raises_exception(self):
+        with self.assertRaises(Exception):
+            self._game.distance(Bitboard(('a', 'b', 'c'), [1, 0, 0]), Bitboard(('a', 'b', 'd'), [1, 0, 0]))
+
+    def test__iter_path__yields_shortest_path_between_every_pair_of_states(self):
+        states = list(itertools.product(range(3), repeat=3))
+        for start in states:
+            for end in states:
+                bitboard = self._create_bitboard(start)
+                moves = list(self._game.iter_path(bitboard, self._create_bitboard(end)))
+                for disk_size, from_name, to_name in moves:
+                    from_mask = bitboard.masks()[bitboard.names().index(from_name)]
+                    self.assertEqual(1 << (disk_size - 1), from_mask & -from_mask)
+                    bitboard = bitboard.move(from_name, to_name)
+
+                self.assertEqual(self._create_bitboard(end), bitboard)
+                self.assertEqual(self._game.distance(self._create_bitboard(start), self._create_bitboard(end)), len(moves))
+
+    def test__iter_moves__when_disk_count_is_2__yields_moves_from_peg_a_to_peg_c(self):
+        moves = list(self._game.iter_moves(2, 'a', 'c', 'b'))
+
+        self.assertEqual([(1, 'a', 'b'), (2, 'a', 'c'), (1, 'b', 'c')], moves)
+
+    def test__iter_moves__when_disk_count_is_3__yields_moves_from_peg_a_to_peg_c(self):
+        moves = list(self._game.iter_moves(3, 'a', 'c', 'b'))
+
+        expected_moves = [
+            (1, 'a', 'c'),
+            (2, 'a', 'b'),
+            (1, 'c', 'b'),
+            (3, 'a', 'c'),
+            (1, 'b', 'a'),
+            (2, 'b', 'c'),
+            (1, 'a', 'c')
+        ]
+        self.assertEqual(expected_moves, moves)
+
+    def test__iter_moves__yields_same_moves_as_move(self):
+        disk_count = 6
+        moves = []
+
+        self._game.move(disk_count, self._game.create_peg('a', disk_count), self._peg_c, self._peg_b, lambda pegs: moves.append((pegs[1].disks()[-1].size(), pegs[0].name(), pegs[1].name())))
+
+        self.assertEqual(moves, list(self._game.iter_moves(disk_count, 'a', 'c', 'b')))
+
+    def test__iter_moves__when_start_and_stop_specified__yields_moves_in_range(self):
+        moves = list(self._game.iter_moves(3, 'a', 'c', 'b', 2, 5))
+
+        self.assertEqual([(1, 'c', 'b'), (3, 'a', 'c'), (1, 'b', 'a')], moves)
+
+    def test__iter_moves__does_not_modify_pegs(self):
+        peg_a = self._create_peg_a([self._disk_2, self._disk_1])
+
+        moves = list(self._game.iter_moves(2, peg_a, self._peg_c, self._peg_b))
+
+        self.assertEqual([(1, peg_a, self._peg_b), (2, peg_a, self._peg_c), (1, self._peg_b, self._peg_c)], moves)
+        self.assertEqual(self._create_peg_a([self._disk_2, self._disk_1]), peg_a)
+        self.assertEqual(self._create_peg_b([]), self._peg_b)
+        self.assertEqual(self._create_peg_c([]), self._peg_c)
+
+    def test__iter_solve__when_disks_on_one_peg__yields_same_moves_as_iter_moves(self):
+        peg_a = self._game.create_peg('a', 4)
+
+        moves = list(self._game.iter_solve([peg_a, self._peg_b, self._peg_c], self._peg_c))
+
+        self.assertEqual(list(self._game.iter_moves(4, peg_a, self._peg_c, self._peg_b)), moves)
+
+    def test__iter_solve__when_disks_on_target_peg__yields_no_moves(self):
+        peg_a, peg_b, peg_c = self._create_pegs((2, 2, 2))
+
+        self.assertEqual([], list(self._game.iter_solve([peg_a, peg_b, peg_c], peg_c)))
+
+    def test__iter_solve__when_disks_scattered__yields_moves_to_target_peg(self):
+        peg_a, peg_b, peg_c = self._create_pegs((0, 1, 2))
+
+        moves = list(self._game.iter_solve([peg_a, peg_b, peg_c], peg_a))
+
+        self.assertEqual([(1, peg_a, peg_b), (3, peg_c, peg_a), (1, peg_b, peg_c), (2, peg_b, peg_a), (1, peg_c, peg_a)], moves)
+
+    def test__iter_solve__when_disk_sizes_not_consecutive__yields_moves_of_disks(self):
+        peg_a, peg_b, peg_c = Peg('a', [Disk(5), Disk(2)]), Peg('b'), Peg('c')
+
+        moves = list(self._game.iter_solve([peg_a, peg_b, peg_c], peg_c))
+
+        self.assertEqual([(2, peg_a, peg_b), (5, peg_a, peg_c), (2, peg_b, peg_c)], moves)
+
+    def test__iter_solve__when_configuration_not_legal__raises_exception(self):
+        peg_a, peg_b, peg_c = Peg('a', [Disk(1), Disk(2)]), Peg('b'), Peg('c')
+
+        with self.assertRaises(Exception):
+            self._game.iter_solve([peg_a, peg_b, peg_c], peg_c)
+
+    def test__iter_solve__when_disk_on_two_pegs__raises_exception(self):
+        peg_a, peg_b, peg_c = Peg('a', [Disk(1)]), Peg('b', [Disk(1)]), Peg('c')
+
+        with self.assertRaises(Exception):
+            self._game.iter_solve([peg_a, peg_b, peg_c], peg_c)
+
     def test__move__when_disk_count_is_1__invokes_callback_after_each_move(self):
         move_spy = GameTestCase._MoveSpy()
         peg_a = self._create_peg_a([self._disk_1])
@@ -206,6 +560,84 @@ class GameTestCase(unittest.TestCase):
         ]
         self.assertEqual(expected_move_spy_call_args_list, move_spy.call_args_list)
 
+    def test__move__when_events_is_true__invokes_callback_with_move_after_each_move(self):
+        move_spy = mock.Mock()
+        peg_a = self._create_peg_a([self._disk_2, self._disk_1])
+
+        self._game.move(2, peg_a, self._peg_c, self._peg_b, move_spy, events=True)
+
+        expected_move_spy_call_args_list = [
+            mock.call(Move(0, self._disk_1, 'a', 'b')),
+            mock.call(Move(1, self._disk_2, 'a', 'c')),
+            mock.call(Move(2, self._disk_1, 'b', 'c'))
+        ]
+        self.assertEqual(expected_move_spy_call_args_list, move_spy.call_args_list)
+
+    def test__move__when_cache_specified__moves_disks_from_peg_a_to_peg_c(self):
+        peg_a = self._game.create_peg('a', 5)
+
+        Game(cache=SolutionCache(block_disk_count=2)).move(5, peg_a, self._peg_c, self._peg_b)
+
+        self.assertEqual(self._create_peg_a([]), peg_a)
+        self.assertEqual(self._create_peg_b([]), self._peg_b)
+        self.assertEqual(self._game.create_peg('c', 5), self._peg_c)
+
+    def test__move__when_cache_specified__invokes_callback_with_same_moves_as_move(self):
+        move_spy = mock.Mock()
+        cached_move_spy = mock.Mock()
+
+        self._game.move(5, self._game.create_peg('a', 5), self._create_peg_c(), self._create_peg_b(), move_spy, events=True)
+        Game(cache=SolutionCache(block_disk_count=2)).move(5, self._game.create_peg('a', 5), self._create_peg_c(), self._create_peg_b(), cached_move_spy, events=True)
+
+        self.assertEqual(move_spy.call_args_list, cached_move_spy.call_args_list)
+
+    def test__move__when_start_specified__invokes_callback_with_remaining_moves(self):
+        disk_count = 6
+        move_spy = mock.Mock()
+        self._game.move(disk_count, self._game.create_peg('a', disk_count), self._create_peg_c(), self._create_peg_b(), move_spy, events=True)
+
+        for game in (self._game, Game(cache=SolutionCache(block_disk_count=2))):
+            for start in range(2 ** disk_count):
+                with self.subTest(start=start):
+                    resumed_move_spy = mock.Mock()
+
+                    game.move(disk_count, *game.state_at(disk_count, start, 'a', 'c', 'b'), callback=resumed_move_spy, events=True, start=start)
+
+                    self.assertEqual(move_spy.call_args_list[start:], resumed_move_spy.call_args_list)
+
+    def test__move__when_metrics_specified__records_moves_and_callbacks(self):
+        metrics = Metrics()
+        move_spy = mock.Mock()
+        peg_a = self._create_peg_a([self._disk_2, self._disk_1])
+
+        Game(metrics).move(2, peg_a, self._peg_c, self._peg_b, move_spy, events=True)
+
+        self.assertEqual(3, metrics.move_count())
+        self.assertEqual(3, metrics.pop_count())
+        self.assertEqual(3, metrics.push_count())
+        self.assertEqual(0, metrics.peg_count())
+        self.assertEqual(3, metrics.callback_count())
+        self.assertEqual(mock.call(Move(2, self._disk_1, 'b', 'c')), move_spy.call_args)
+        self.assertGreater(metrics.engine_seconds(), 0.0)
+
+    def test__move__when_metrics_specified_and_callback_not_specified__records_no_callbacks(self):
+        metrics = Metrics()
+        peg_a = self._create_peg_a([self._disk_2, self._disk_1])
+
+        Game(metrics).move(2, peg_a, self._peg_c, self._peg_b)
+
+        self.assertEqual(3, metrics.move_count())
+        self.assertEqual(0, metrics.callback_count())
+        self.assertEqual(0.0, metrics.callback_seconds())
+
+    def test__move__when_profiler_specified__profiles_move(self):
+        profiler = cProfile.Profile()
+        peg_a = self._create_peg_a([self._disk_2, self._disk_1])
+
+        self._game.move(2, peg_a, self._peg_c, self._peg_b, profiler=profiler)
+
+        self.assertIn('_move', [function_name for _, _, function_name in pstats.Stats(profiler).stats])
+
     def test__move__when_disk_count_is_2__moves_disks_from_peg_a_to_peg_c(self):
         peg_a = self._create_peg_a([self._disk_2, self._disk_1])
 
@@ -233,11 +665,200 @@ class GameTestCase(unittest.TestCase):
         self.assertEqual(self._create_peg_b([]), self._peg_b)
         self.assertEqual(self._create_peg_c([self._disk_4, self._disk_3, self._disk_2, self._disk_1]), self._peg_c)
 
+    def test__move__when_disk_count_exceeds_available_stack_depth__moves_disks_from_peg_a_to_peg_c(self):
+        disk_count = 16
+        peg_a = self._game.create_peg('a', disk_count)
+        recursion_limit = sys.getrecursionlimit()
+
+        sys.setrecursionlimit(len(inspect.stack(0)) + 13)
+        try:
+            self._game.move(disk_count, peg_a, self._peg_c, self._peg_b)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        self.assertEqual(self._game.create_peg('c', disk_count), self._peg_c)
+
     def test__move__when_disk_count_exceeds_source_peg_disk_count__raises_exception(self):
         peg_a = self._create_peg_a([self._disk_1])
 
         with self.assertRaises(Exception):
             self._game.move(2, peg_a, self._peg_c, self._peg_b)
 
+    def test__move_bitboard__when_callback_specified__invokes_callback_with_same_states_as_state_at(self):
+        disk_count = 4
+        bitboards = []
+
+        self._game.move_bitboard(disk_count, Bitboard(('a', 'c', 'b'), [0b1111, 0, 0]), 'a', 'c', 'b', bitboards.append)
+
+        expected_bitboards = [Bitboard.from_pegs(self._game.state_at(disk_count, move_count, 'a', 'c', 'b')) for move_count in range(1, 2 ** disk_count)]
+        self.assertEqual(expected_bitboards, bitboards)
+
+    def test__move_bitboard__when_callback_specified__returns_final_state(self):
+        bitboard = self._game.move_bitboard(3, Bitboard(('a', 'b', 'c'), [0b1111, 0, 0]), 'a', 'c', 'b', lambda bitboard: None)
+
+        self.assertEqual(Bitboard(('a', 'b', 'c'), [0b1000, 0, 0b111]), bitboard)
+
+    def test__move_bitboard__when_callback_not_specified__returns_final_state(self):
+        bitboard = self._game.move_bitboard(3, Bitboard(('a', 'b', 'c'), [0b1111, 0, 0]), 'a', 'c', 'b')
+
+        self.assertEqual(Bitboard(('a', 'b', 'c'), [0b1000, 0, 0b111]), bitboard)
+
+    def test__move_bitboard__when_disks_not_at_top_of_source_peg__raises_exception(self):
+        with self.assertRaises(Exception):
+            self._game.move_bitboard(2, Bitboard(('a', 'b', 'c'), [0b10, 0b1, 0]), 'a', 'c', 'b')
+
+    def test__move_at__returns_same_moves_as_iter_moves(self):
+        disk_count = 6
+        moves = list(self._game.iter_moves(disk_count, 'a', 'c', 'b'))
+
+        for move_index, move in enumerate(moves):
+            self.assertEqual(move, self._game.move_at(disk_count, move_index, 'a', 'c', 'b'))
+
+    def test__move_at__when_disk_count_is_large__returns_move(self):
+        disk_count = 40
+
+        move = self._game.move_at(disk_count, 2 ** 39 - 1, 'a', 'c', 'b')
+
+        self.assertEqual((40, 'a', 'c'), move)
+
+    def test__move_at__when_move_index_out_of_range__raises_exception(self):
+        with self.assertRaises(Exception):
+            self._game.move_at(2, 3, 'a', 'c', 'b')
+
+    def test__moves_at__returns_moves_in_order_of_indices(self):
+        moves = self._game.moves_at(3, [6, 0, 3], 'a', 'c', 'b')
+
+        self.assertEqual([(1, 'a', 'c'), (1, 'a', 'c'), (3, 'a', 'c')], moves)
+
+    def test__moves_at__when_move_indices_is_generator__returns_moves_in_order_of_indices(self):
+        for numpy in (vectorized.numpy, None):
+            with self.subTest(numpy=numpy is not None), mock.patch.object(vectorized, 'numpy', numpy):
+                moves = self._game.moves_at(3, (move_index for move_index in [6, 0, 3]), 'a', 'c', 'b')
+
+                self.assertEqual([(1, 'a', 'c'), (1, 'a', 'c'), (3, 'a', 'c')], moves)
+
+    def test__moves_at__when_move_index_out_of_range__raises_exception(self):
+        with self.assertRaises(Exception):
+            self._game.moves_at(2, [0, 3], 'a', 'c', 'b')
+
+    def test__solve__moves_disks_to_target_peg_in_fewest_moves(self):
+        disk_count = 4
+        for target in range(3):
+            move_counts = self._shortest_move_counts((target,) * disk_count)
+            for peg_indices, move_count in move_counts.items():
+                pegs = self._create_pegs(peg_indices)
+                callback = mock.Mock()
+
+                self._game.solve(pegs, pegs[target], callback)
+
+                self.assertEqual(self._create_pegs((target,) * disk_count), pegs)
+                self.assertEqual(move_count, callback.call_count)
+
+    def test__solve__when_events_is_true__invokes_callback_with_move_after_each_move(self):
+        pegs = self._create_pegs((0, 1))
+        move_spy = mock.Mock()
+
+        self._game.solve(pegs, pegs[2], move_spy, events=True)
+
+        expected_move_spy_call_args_list = [
+            mock.call(Move(0, self._disk_2, 'b', 'c')),
+            mock.call(Move(1, self._disk_1, 'a', 'c'))
+        ]
+        self.assertEqual(expected_move_spy_call_args_list, move_spy.call_args_list)
+
+    def test__state_at__returns_same_states_as_move(self):
+        disk_count = 4
+        states = [self._game.state_at(disk_count, 0, 'a', 'c', 'b')]
+
+        def record_state(pegs):
+            pegs_by_name = {peg.name(): Peg(peg.name(), peg.disks()) for peg in pegs}
+            states.append((pegs_by_name['a'], pegs_by_name['c'], pegs_by_name['b']))
+
+        self._game.move(disk_count, self._game.create_peg('a', disk_count), self._peg_c, self._peg_b, record_state)
+
+        for move_count, state in enumerate(states):
+            self.assertEqual(state, self._game.state_at(disk_count, move_count, 'a', 'c', 'b'))
+
+    def test__state_at__when_move_count_is_0__returns_initial_state(self):
+        state = self._game.state_at(3, 0, 'a', 'c', 'b')
+
+        self.assertEqual((self._game.create_peg('a', 3), self._game.create_peg('c'), self._game.create_peg('b')), state)
+
+    def test__state_at__when_all_moves_performed__returns_final_state(self):
+        state = self._game.state_at(3, 7, 'a', 'c', 'b')
+
+        self.assertEqual((self._game.create_peg('a'), self._game.create_peg('c', 3), self._game.create_peg('b')), state)
+
+    def test__state_at__when_disk_count_is_large__returns_state(self):
+        peg_a, peg_c, peg_b = self._game.state_at(40, 2 ** 39, 'a', 'c', 'b')
+
+        self.assertEqual([], peg_a.disks())
+        self.assertEqual([Disk(40)], peg_c.disks())
+        self.assertEqual(self._game.create_peg('b', 39).disks(), peg_b.disks())
+
+    def test__state_at__when_move_count_out_of_range__raises_exception(self):
+        with self.assertRaises(Exception):
+            self._game.state_at(2, 4, 'a', 'c', 'b')
+
+class MultiPegGameTestCase(unittest.TestCase):
+    def setUp(self):
+        self._game = Game()
+        self._multi_peg_game = MultiPegGame()
+
+    def test__iter_moves__when_peg_count_is_3__yields_same_moves_as_game(self):
+        moves = list(self._multi_peg_game.iter_moves(5, ['a', 'c', 'b']))
+
+        self.assertEqual(list(self._game.iter_moves(5, 'a', 'c', 'b')), moves)
+
+    def test__iter_moves__when_peg_count_is_4__yields_moves_from_peg_a_to_peg_d(self):
+        moves = list(self._multi_peg_game.iter_moves(3, ['a', 'd', 'b', 'c']))
+
+        self.assertEqual([(1, 'a', 'b'), (2, 'a', 'c'), (3, 'a', 'd'), (2, 'c', 'd'), (1, 'b', 'd')], moves)
+
+    def test__move__when_peg_count_is_5__moves_disks_from_peg_a_to_peg_b(self):
+        disk_count = 12
+        pegs = [self._game.create_peg('a', disk_count), Peg('b'), Peg('c'), Peg('d'), Peg('e')]
+        callback = mock.Mock()
+
+        self._multi_peg_game.move(disk_count, pegs, callback)
+
+        self.assertEqual(self._game.create_peg('b', disk_count), pegs[1])
+        self.assertEqual([Peg('a'), Peg('c'), Peg('d'), Peg('e')], [pegs[0]] + pegs[2:])
+        self.assertEqual(self._multi_peg_game.move_count(disk_count, 5), callback.call_count)
+
+    def test__move__when_events_is_true__invokes_callback_with_move_after_each_move(self):
+        pegs = [Peg('a', [Disk(2), Disk(1)]), Peg('b'), Peg('c'), Peg('d')]
+        move_spy = mock.Mock()
+
+        self._multi_peg_game.move(2, pegs, move_spy, events=True)
+
+        expected_move_spy_call_args_list = [
+            mock.call(Move(0, Disk(1), 'a', 'c')),
+            mock.call(Move(1, Disk(2), 'a', 'b')),
+            mock.call(Move(2, Disk(1), 'c', 'b'))
+        ]
+        self.assertEqual(expected_move_spy_call_args_list, move_spy.call_args_list)
+
+    def test__move__when_disk_count_exceeds_source_peg_disk_count__raises_exception(self):
+        pegs = [Peg('a', [Disk(1)]), Peg('b'), Peg('c'), Peg('d')]
+
+        with self.assertRaises(Exception):
+            self._multi_peg_game.move(2, pegs)
+
+    def test__move_count__when_peg_count_is_3__returns_move_count_of_game(self):
+        self.assertEqual([2 ** disk_count - 1 for disk_count in range(10)], [self._multi_peg_game.move_count(disk_count, 3) for disk_count in range(10)])
+
+    def test__move_count__when_peg_count_is_4__returns_frame_stewart_numbers(self):
+        self.assertEqual([0, 1, 3, 5, 9, 13, 17, 25, 33, 41, 49], [self._multi_peg_game.move_count(disk_count, 4) for disk_count in range(11)])
+
+    def test__move_count__when_peg_count_is_5__returns_frame_stewart_numbers(self):
+        self.assertEqual([0, 1, 3, 5, 7, 11, 15, 19, 23, 27, 31], [self._multi_peg_game.move_count(disk_count, 5) for disk_count in range(11)])
+
+    def test__move_count__equals_count_of_moves_yielded_by_iter_moves(self):
+        for peg_count in range(3, 7):
+            pegs = list(range(peg_count))
+            for disk_count in range(1, 12):
+                self.assertEqual(self._multi_peg_game.move_count(disk_count, peg_count), len(list(self._multi_peg_game.iter_moves(disk_count, pegs))))
+
 if __name__ == '__main__':
     unittest.main()
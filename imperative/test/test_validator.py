@@ -0,0 +1,111 @@
+import unittest
+import unittest.mock as mock
+
+import vectorized
+from tower_of_hanoi import Bitboard, Game
+from validator import validate, validate_arrays
+
+class ValidatorTestCase(unittest.TestCase):
+    def _create_tower(self, disk_count, peg_index):
+        masks = [0, 0, 0]
+        masks[peg_index] = (1 << disk_count) - 1
+        return Bitboard(('a', 'b', 'c'), masks)
+
+    def _solution_arrays(self, disk_count):
+        peg_indices = {'a': 0, 'b': 1, 'c': 2}
+        moves = list(Game().iter_moves(disk_count, 'a', 'c', 'b'))
+        return (
+            [disk_size for disk_size, _, _ in moves],
+            [peg_indices[from_name] for _, from_name, _ in moves],
+            [peg_indices[to_name] for _, _, to_name in moves]
+        )
+
+    def test__validate__when_moves_solve_game__returns_valid_result(self):
+        disk_count = 6
+        moves = Game().iter_moves(disk_count, 'a', 'c', 'b')
+
+        result = validate(self._create_tower(disk_count, 0), moves, self._create_tower(disk_count, 2))
+
+        self.assertTrue(result.is_valid())
+        self.assertEqual(63, result.move_count())
+        self.assertIsNone(result.error_index())
+
+    def test__validate__when_goal_not_specified__accepts_any_legal_moves(self):
+        result = validate(self._create_tower(3, 0), [(1, 'a', 'b'), (2, 'a', 'c'), (1, 'b', 'a')])
+
+        self.assertTrue(result.is_valid())
+        self.assertEqual(3, result.move_count())
+
+    def test__validate__when_goal_not_reached__returns_invalid_result(self):
+        moves = list(Game().iter_moves(3, 'a', 'c', 'b'))[:-1]
+
+        result = validate(self._create_tower(3, 0), moves, self._create_tower(3, 2))
+
+        self.assertFalse(result.is_valid())
+        self.assertEqual(6, result.move_count())
+        self.assertIsNone(result.error_index())
+        self.assertEqual('moves do not reach the goal', result.error())
+
+    def test__validate__when_goal_has_other_pegs__raises_exception(self):
+        with self.assertRaises(Exception):
+            validate(self._create_tower(3, 0), [], Bitboard(('a', 'b', 'd'), (0, 0, 7)))
+
+    def test__validate__when_move_is_illegal__returns_index_of_move(self):
+        cases = [
+            ([(1, 'a', 'b'), (1, 'c', 'a')], 1, 'peg is empty'),
+            ([(1, 'a', 'b'), (1, 'a', 'c')], 1, 'disk is not at the top of the peg'),
+            ([(1, 'a', 'b'), (2, 'a', 'b')], 1, 'disk must be smaller than top disk'),
+            ([(1, 'a', 'a')], 0, 'disk must be moved to another peg'),
+            ([(1, 'a', 'b'), (1, 'b', 'd')], 1, 'peg does not exist')
+        ]
+        for moves, error_index, error in cases:
+            with self.subTest(error=error):
+                result = validate(self._create_tower(3, 0), moves)
+
+                self.assertFalse(result.is_valid())
+                self.assertEqual(error_index, result.move_count())
+                self.assertEqual(error_index, result.error_index())
+                self.assertEqual(error, result.error())
+
+    def test__validate_arrays__when_arrays_are_lists__returns_same_result_as_validate(self):
+        disk_sizes, from_indices, to_indices = self._solution_arrays(5)
+        to_indices[20] = from_indices[20]
+
+        result = validate_arrays(self._create_tower(5, 0), disk_sizes, from_indices, to_indices, self._create_tower(5, 2))
+
+        self.assertEqual(20, result.error_index())
+        self.assertEqual('disk must be moved to another peg', result.error())
+
+    @unittest.skipUnless(vectorized.is_available(), 'numpy is not installed')
+    def test__validate_arrays__when_arrays_solve_game__returns_valid_result(self):
+        numpy = vectorized.numpy
+        disk_count = 9
+        arrays = [numpy.array(array) for array in self._solution_arrays(disk_count)]
+
+        result = validate_arrays(self._create_tower(disk_count, 0), *arrays, goal=self._create_tower(disk_count, 2), block_size=100)
+
+        self.assertTrue(result.is_valid())
+        self.assertEqual(511, result.move_count())
+
+    @unittest.skipUnless(vectorized.is_available(), 'numpy is not installed')
+    def test__validate_arrays__when_arrays_differ_from_solution__returns_same_result_with_and_without_numpy(self):
+        numpy = vectorized.numpy
+        disk_count = 9
+        disk_sizes, from_indices, to_indices = self._solution_arrays(disk_count)
+        # Moves the smallest disk back and forth, then continues the solution.
+        disk_sizes[299:299] = [1, 1]
+        from_indices[299:299] = [to_indices[298], from_indices[298]]
+        to_indices[299:299] = [from_indices[298], to_indices[298]]
+        disk_sizes[400] = 9
+        arrays = [numpy.array(array) for array in (disk_sizes, from_indices, to_indices)]
+
+        result = validate_arrays(self._create_tower(disk_count, 0), *arrays, goal=self._create_tower(disk_count, 2), block_size=100)
+        with mock.patch.object(vectorized, 'numpy', None):
+            scalar_result = validate_arrays(self._create_tower(disk_count, 0), *arrays, goal=self._create_tower(disk_count, 2), block_size=100)
+
+        self.assertEqual(400, result.error_index())
+        self.assertEqual('disk is not at the top of the peg', result.error())
+        self.assertEqual(repr(scalar_result), repr(result))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# The functions in this module compute whole blocks of moves with array
+# operations instead of one Python call per move.  NumPy is optional; use
+# `is_available` to determine whether these functions may be called.  NumPy
+# is only imported by the first call to one of them, so importing this module
+# does not load it.
+numpy = None
+_is_numpy_imported = False
+
+# Move numbers are held in 64-bit integers.
+MAX_DISK_COUNT = 62
+
+def _import_numpy():
+    global _is_numpy_imported, numpy
+    if not _is_numpy_imported:
+        try:
+            import numpy
+        except ImportError:
+            pass
+        _is_numpy_imported = True
+    return numpy
+
+def is_available():
+    '''
+    Indicates NumPy is installed.
+
+    :returns: `True` if NumPy is installed; otherwise `False`.
+    '''
+
+    return _import_numpy() is not None
+
+def move_arrays(disk_count, move_indices):
+    '''
+    Returns the moves at the specified indices of the solution that moves the
+    specified count of disks from the source peg to the destination peg.
+
+    Pegs are identified by their index in `(source, destination,
+    intermediate)` order.
+
+    :param disk_count: The count of disks to move; must be positive and must
+        not exceed `MAX_DISK_COUNT`.
+    :type disk_count: int
+    :param move_indices: The array or sequence of zero-based move indices;
+        each must be less than `2 ** disk_count - 1`.
+
+    :returns: A tuple of three arrays of the same length as `move_indices`
+        containing the disk size, from peg index, and to peg index of each
+        move.
+
+    :raises: Exception - If NumPy is not installed.
+    '''
+
+    if _import_numpy() is None:
+        raise Exception('numpy is not installed')
+
+    assert 0 < disk_count <= MAX_DISK_COUNT
+
+    move_numbers = numpy.asarray(move_indices, dtype=numpy.int64) + 1
+    assert (move_numbers.size == 0) or ((move_numbers.min() > 0) and (move_numbers.max() < 2 ** disk_count))
+
+    # See `Game._move_at` for the derivation of each move from its number;
+    # the exponent of the lowest set bit is extracted with `frexp`, which is
+    # exact for powers of two.  The peg cycle matches `Game._cycle_pegs`.
+    lowest_bits = move_numbers & -move_numbers
+    disk_sizes = numpy.frexp(lowest_bits.astype(numpy.float64))[1].astype(numpy.int8)
+    peg_cycle = numpy.array((0, 1, 2) if disk_count % 2 == 0 else (0, 2, 1), dtype=numpy.int8)
+    from_indices = peg_cycle[(move_numbers & (move_numbers - 1)) % 3]
+    to_indices = peg_cycle[((move_numbers | (move_numbers - 1)) + 1) % 3]
+    return (disk_sizes, from_indices, to_indices)
+
+def iter_move_arrays(disk_count, start=0, stop=None, block_size=1 << 20):
+    '''
+    Returns an iterator over blocks of consecutive moves of the solution that
+    moves the specified count of disks from the source peg to the destination
+    peg.
+
+    :param disk_count: The count of disks to move; must be positive and must
+        not exceed `MAX_DISK_COUNT`.
+    :type disk_count: int
+    :param start: The index of the first move.  Defaults to 0.
+    :type start: int
+    :param stop: The index *after* the last move.  Defaults to `None`, in which
+        case all remaining moves are included.
+    :type stop: int
+    :param block_size: The maximum count of moves in each block; must be
+        positive.  Defaults to 1048576.
+    :type block_size: int
+
+    :returns: An iterator of `(start, disk_sizes, from_indices, to_indices)`
+        tuples, where `start` is the index of the first move in the block and
+        the arrays are as returned by `move_arrays`.
+
+    :raises: Exception - If NumPy is not installed.
+    '''
+
+    if _import_numpy() is None:
+        raise Exception('numpy is not installed')
+
+    assert 0 < disk_count <= MAX_DISK_COUNT
+    move_count = 2 ** disk_count - 1
+    if stop is None:
+        stop = move_count
+    assert 0 <= start <= stop <= move_count
+    assert block_size > 0
+
+    return (
+        (block_start,) + move_arrays(disk_count, numpy.arange(block_start, min(block_start + block_size, stop), dtype=numpy.int64))
+        for block_start in range(start, stop, block_size)
+    )